@@ -0,0 +1,189 @@
+"""
+Bulk insertion of attendance registrations.
+
+``bulk_insert_attendances()`` inserts many attendances with one
+``INSERT ... ON CONFLICT DO NOTHING`` (``INSERT OR IGNORE`` on SQLite),
+linking their participants first, and then updates what the Attendance
+post_save signals would have: the event stats, the survey term index and the
+cached survey analytics. It is shared by the attendance wizard, the spool
+worker (core/attendance_spool.py) and the offline form's sync endpoint.
+
+Duplicates are rejected by the database at insert time, not by a SELECT
+first: ``Attendance.submission_key`` is unique, so a retried submission is
+ignored, and (event, ``participant_key``) is unique, so the same person
+cannot register twice for one event.
+
+``ingest_offline_submissions()`` validates a batch sent by the offline
+attendance form, whose submissions carry client-generated submission keys.
+"""
+import uuid
+from collections import defaultdict
+
+import django
+from django.db import connection, transaction
+from django.db.models.constants import OnConflict
+from django.db.models.sql import InsertQuery
+
+from . import survey_analytics, survey_terms
+from .event_stats import refresh_event_attendance_stats
+from .forms import AttendanceForm
+from .models import Attendance
+from .participants import link_participants
+
+# Largest batch the sync endpoint accepts in one request
+MAX_SYNC_BATCH = 50
+
+
+# Django releases whose InsertQuery/SQLInsertCompiler internals the RETURNING
+# fast path was checked against; others use bulk_create() and read back the keys.
+RETURNING_INSERT_DJANGO_VERSIONS = {(5, 2)}
+
+
+def _insert_ignoring_conflicts(attendances):
+    """
+    INSERT ... ON CONFLICT DO NOTHING, returning {submission_key: pk} of the
+    rows actually inserted.
+
+    bulk_create(ignore_conflicts=True) returns nothing, so by default the keys
+    already stored are read before the insert and the new rows are read back
+    by key afterwards. Uniqueness is still enforced by the constraints, not by
+    that read.
+    """
+    if _can_insert_returning():
+        return _insert_returning(attendances)
+    keys = [attendance.submission_key for attendance in attendances]
+    existing = set(Attendance.objects.filter(submission_key__in=keys).values_list("submission_key", flat=True))
+    Attendance.objects.bulk_create(attendances, batch_size=500, ignore_conflicts=True)
+    return dict(
+        Attendance.objects.filter(submission_key__in=set(keys) - existing).values_list("submission_key", "pk")
+    )
+
+
+def _can_insert_returning():
+    return (
+        django.VERSION[:2] in RETURNING_INSERT_DJANGO_VERSIONS
+        and connection.features.can_return_rows_from_bulk_insert
+    )
+
+
+def _insert_returning(attendances):
+    """
+    Fast path of _insert_ignoring_conflicts(): one statement per batch, no reads.
+
+    Compiles the insert with Django's private InsertQuery so the database's
+    RETURNING clause (PostgreSQL, SQLite 3.35+, MariaDB 10.5+) reports the rows
+    it stored; skipped rows are absent from the result. Only used on the
+    Django versions in RETURNING_INSERT_DJANGO_VERSIONS.
+    """
+    meta = Attendance._meta
+    fields = [field for field in meta.concrete_fields if not field.primary_key]
+    returning_fields = [meta.pk, meta.get_field("submission_key")]
+    batch_size = min(500, max(connection.ops.bulk_batch_size(fields, attendances), 1))
+    stored = {}
+    with connection.cursor() as cursor:
+        for start in range(0, len(attendances), batch_size):
+            query = InsertQuery(Attendance, on_conflict=OnConflict.IGNORE)
+            query.insert_values(fields, attendances[start:start + batch_size])
+            compiler = query.get_compiler(connection=connection)
+            compiler.returning_fields = returning_fields
+            for sql, params in compiler.as_sql():
+                cursor.execute(sql, params)
+                # SQLite returns the UUID as 32 hex digits
+                stored.update((_parse_key(key), pk) for pk, key in cursor.fetchall())
+    return stored
+
+
+def bulk_insert_attendances(attendances, project_ids):
+    """
+    Insert attendances, skipping duplicates, and refresh their derived data.
+
+    Args:
+        attendances: Unsaved Attendance instances with event_id set; those
+            without a submission_key get a new one
+        project_ids: {event_id: project id or None} for every event involved
+
+    Returns:
+        list: The attendances actually inserted, with their pk set
+    """
+    if not attendances:
+        return []
+    for attendance in attendances:
+        if attendance.submission_key is None:
+            attendance.submission_key = uuid.uuid4()
+        attendance.participant_key = Attendance.build_participant_key(
+            attendance.email, attendance.wiki_username
+        )
+
+    with transaction.atomic():
+        link_participants(attendances)
+        stored = _insert_ignoring_conflicts(attendances)
+        inserted = []
+        by_event = defaultdict(list)
+        for attendance in attendances:
+            # pop: a key repeated within the batch was only inserted once
+            pk = stored.pop(attendance.submission_key, None)
+            if pk is not None:
+                attendance.pk = pk
+                attendance._state.adding = False
+                inserted.append(attendance)
+                by_event[attendance.event_id].append(attendance)
+
+        # The rows were inserted without save(), so no post_save signals
+        for event_id, event_attendances in by_event.items():
+            refresh_event_attendance_stats(event_id)
+            survey_terms.index_attendances(event_id, event_attendances)
+
+    for event_id in by_event:
+        survey_analytics.invalidate(event_id=event_id, project_id=project_ids.get(event_id))
+    return inserted
+
+
+def _parse_key(value):
+    try:
+        return uuid.UUID(str(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def ingest_offline_submissions(event, submissions):
+    """
+    Validate and insert a batch of offline submissions for one event.
+
+    Args:
+        event: Event of the attendance link
+        submissions: [{'key': '<uuid>', 'data': {field: value}}, ...]
+
+    Returns:
+        dict: 'accepted' and 'duplicates' (lists of keys) and 'rejected'
+        ({key: {field: [errors]}}); the client can forget every key listed
+    """
+    result = {"accepted": [], "duplicates": [], "rejected": {}}
+    pending = {}
+    for submission in submissions:
+        if not isinstance(submission, dict):
+            continue
+        key = _parse_key(submission.get("key"))
+        if key is None:
+            result["rejected"][str(submission.get("key"))] = {"key": ["Clave de envío inválida."]}
+            continue
+        if key in pending:
+            result["duplicates"].append(str(key))
+            continue
+        data = submission.get("data")
+        form = AttendanceForm(data=data if isinstance(data, dict) else {})
+        if not form.is_valid():
+            result["rejected"][str(key)] = {
+                field: [str(error) for error in errors] for field, errors in form.errors.items()
+            }
+            continue
+        attendance = form.save(commit=False)
+        attendance.event = event
+        attendance.submission_key = key
+        pending[key] = attendance
+
+    inserted = bulk_insert_attendances(list(pending.values()), {event.pk: event.proyecto_id})
+    inserted_keys = {attendance.submission_key for attendance in inserted}
+    result["accepted"].extend(str(attendance.submission_key) for attendance in inserted)
+    # Sent before, or the same participant already registered for the event
+    result["duplicates"].extend(str(key) for key in pending if key not in inserted_keys)
+    return result
@@ -0,0 +1,244 @@
+"""
+Write-behind ingestion of attendance registrations.
+
+When ``settings.ATTENDANCE_INGESTION`` is ``'spool'``, the wizard's final step
+validates the answers and writes them as one JSON file under
+``settings.ATTENDANCE_SPOOL_DIR`` (temporary file, fsync, atomic rename)
+instead of inserting the attendance, so a burst of submissions never queues
+up behind SQLite's single writer. The ``drain_attendance_spool`` management
+command claims spooled files in batches and inserts each batch with
+``bulk_insert_attendances()`` (one ``INSERT ... ON CONFLICT DO NOTHING`` plus
+the event stats, term index and analytics cache updates the Attendance
+signals would have done).
+
+Files claimed by a worker that dies before removing them are requeued after
+``ATTENDANCE_SPOOL_STALE_AFTER`` seconds. Each file's id is stored as the
+attendance's ``submission_key``, so the insert skips a batch committed just
+before such a crash, as well as a wizard submission spooled twice.
+"""
+import json
+import logging
+import os
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError
+from django.utils import timezone
+
+from .attendance_bulk import bulk_insert_attendances
+from .forms import AttendanceForm
+from .models import Event
+
+logger = logging.getLogger(__name__)
+
+CLAIMED_DIR = "claimed"
+FAILED_DIR = "failed"
+
+
+def get_spool_dir(subdir=None) -> Path:
+    """Return the spool directory (or one of its subdirectories), creating it if needed."""
+    spool_dir = Path(settings.ATTENDANCE_SPOOL_DIR)
+    if subdir:
+        spool_dir = spool_dir / subdir
+    spool_dir.mkdir(parents=True, exist_ok=True)
+    return spool_dir
+
+
+def spool_attendance(event, cleaned_data, submission_key=None):
+    """
+    Durably queue a validated registration for the ingestion worker.
+
+    Args:
+        event: Event the attendance belongs to
+        cleaned_data: AttendanceForm.cleaned_data
+        submission_key: Idempotency key of the submission (a new one if None)
+
+    Returns:
+        str: Submission id (also part of the file name)
+    """
+    submission_id = uuid.UUID(str(submission_key)).hex if submission_key else uuid.uuid4().hex
+    payload = {
+        "id": submission_id,
+        "event_id": event.pk,
+        "submitted_at": timezone.now(),
+        "data": cleaned_data,
+    }
+    spool_dir = get_spool_dir()
+    # Time-prefixed names make the worker ingest in submission order
+    name = f"{time.time_ns()}-{submission_id}.json"
+
+    fd, tmp_path = tempfile.mkstemp(dir=spool_dir, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle, cls=DjangoJSONEncoder, ensure_ascii=False)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, spool_dir / name)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return submission_id
+
+
+def pending_count():
+    """Number of registrations waiting in the spool."""
+    return sum(1 for _ in get_spool_dir().glob("*.json"))
+
+
+def claim_batch(limit):
+    """
+    Move up to ``limit`` spooled files into the claimed directory.
+
+    A file another worker renamed first is skipped, so several workers can
+    drain the same spool.
+
+    Returns:
+        list: Paths of the claimed files, oldest first
+    """
+    claimed_dir = get_spool_dir(CLAIMED_DIR)
+    claimed = []
+    for path in sorted(get_spool_dir().glob("*.json")):
+        if len(claimed) >= limit:
+            break
+        target = claimed_dir / path.name
+        try:
+            os.rename(path, target)
+        except FileNotFoundError:
+            continue
+        # Claim time, used to detect workers that died mid-batch
+        os.utime(target)
+        claimed.append(target)
+    return claimed
+
+
+def requeue_stale_claims():
+    """
+    Return files claimed by crashed workers to the spool.
+
+    Returns:
+        int: Number of files requeued
+    """
+    spool_dir = get_spool_dir()
+    cutoff = time.time() - settings.ATTENDANCE_SPOOL_STALE_AFTER
+    requeued = 0
+    for path in get_spool_dir(CLAIMED_DIR).glob("*.json"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                os.rename(path, spool_dir / path.name)
+                requeued += 1
+        except FileNotFoundError:
+            continue
+    return requeued
+
+
+def release_claims(paths):
+    """Return claimed files to the spool, e.g. after a database error."""
+    spool_dir = get_spool_dir()
+    for path in paths:
+        try:
+            os.rename(path, spool_dir / path.name)
+        except FileNotFoundError:
+            continue
+
+
+def _fail(path, reason):
+    logger.error("Spooled attendance %s rejected: %s", path.name, reason)
+    os.replace(path, get_spool_dir(FAILED_DIR) / path.name)
+
+
+def _read_payload(path):
+    """
+    Load a spooled file and check its shape.
+
+    Returns:
+        tuple: (event id, submission key as UUID, form data)
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If it is not valid JSON or misses a field
+    """
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(payload, dict):
+        raise ValueError("payload is not an object")
+    event_id, data = payload.get("event_id"), payload.get("data")
+    if not isinstance(event_id, int) or isinstance(event_id, bool):
+        raise ValueError("missing or invalid event_id")
+    if not isinstance(data, dict):
+        raise ValueError("missing or invalid data")
+    try:
+        submission_key = uuid.UUID(str(payload["id"]))
+    except (KeyError, ValueError):
+        raise ValueError("missing or invalid id") from None
+    return event_id, submission_key, data
+
+
+def ingest_batch(paths):
+    """
+    Insert the claimed registrations with one bulk insert (which skips those
+    already stored) and refresh the data the Attendance signals maintain.
+    Unreadable, malformed or invalid files, and those of deleted events, are
+    moved to the failed directory.
+
+    Returns:
+        int: Number of attendances inserted
+
+    Raises:
+        DatabaseError: If the insert fails (e.g. "database is locked"); the
+            valid files are back in the spool for a later batch
+    """
+    payloads = []
+    for path in paths:
+        try:
+            payloads.append((path, *_read_payload(path)))
+        except (OSError, ValueError) as exc:
+            _fail(path, exc)
+
+    projects = dict(
+        Event.objects.filter(pk__in={event_id for _path, event_id, _key, _data in payloads})
+        .values_list("pk", "proyecto_id")
+    )
+
+    attendances = []
+    ingested_paths = []
+    for path, event_id, submission_key, data in payloads:
+        if event_id not in projects:
+            _fail(path, "event no longer exists")
+            continue
+        form = AttendanceForm(data=data)
+        if not form.is_valid():
+            _fail(path, form.errors.as_json())
+            continue
+        attendance = form.save(commit=False)
+        attendance.event_id = event_id
+        attendance.submission_key = submission_key
+        attendances.append(attendance)
+        ingested_paths.append(path)
+
+    try:
+        inserted = bulk_insert_attendances(attendances, projects)
+    except DatabaseError:
+        release_claims(ingested_paths)
+        raise
+    for path in ingested_paths:
+        path.unlink(missing_ok=True)
+    return len(inserted)
+
+
+def drain_spool(batch_size=200):
+    """
+    Ingest everything currently in the spool.
+
+    Returns:
+        int: Number of attendances inserted
+    """
+    total = 0
+    while True:
+        paths = claim_batch(batch_size)
+        if not paths:
+            return total
+        total += ingest_batch(paths)
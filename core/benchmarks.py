@@ -0,0 +1,264 @@
+"""
+Benchmark helpers for the report generators.
+
+Builds synthetic projects with a configurable number of events, activities and
+attendances, runs the generators end to end and collects wall time, query counts
+and memory from each generator's GenerationProfile. Used by the
+``benchmark_reports`` management command, which runs them in a throwaway database.
+
+``run_startup_benchmarks()`` times loading the WSGI application in new processes
+with and without the development tooling (``DJANGO_DEV_TOOLS``), for the
+``benchmark_startup`` command.
+"""
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+from datetime import date, timedelta
+
+from django.conf import settings
+
+from .event_stats import SATISFACTION_FIELDS, refresh_all_event_attendance_stats
+from .models import Activity, Attendance, Event, Project
+from .participants import link_participants
+from .reports_generator.activity import ActivityReportGenerator
+from .reports_generator.event import EventReportGenerator
+from .reports_generator.project import ProjectReportGenerator
+
+
+def create_synthetic_project(events=10, activities=10, attendances_per_event=30, seed=0):
+    """
+    Create a project with synthetic related rows using bulk inserts.
+
+    About a third of the participants attend more than one event, so retention
+    and geographic diversity metrics have realistic work to do.
+
+    Returns:
+        Project: The created project
+    """
+    rng = random.Random(seed)
+    start = date(2026, 1, 1)
+    departments = [value for value, _label in Attendance.DepartmentChoices.choices]
+    incidences = [value for value, _label in Attendance.ActivityIncidenceChoices.choices]
+
+    project = Project.objects.create(
+        name=f"Proyecto sintético {seed}",
+        program="ASC",
+        start_date=start,
+        end_date=start + timedelta(days=364),
+        responsible="Benchmark",
+        description="Datos sintéticos para pruebas de rendimiento.",
+    )
+
+    Activity.objects.bulk_create([
+        Activity(
+            project=project,
+            name=f"Actividad {i}",
+            date=start + timedelta(days=i % 365),
+            area=rng.choice(["ASC", "TC", "DA"]),
+            description="Actividad sintética " * 5,
+            participants=rng.randint(0, 200),
+            reached_people=rng.randint(0, 2000),
+            created_content=rng.randint(0, 50),
+            participants_verification="https://example.org/verificacion",
+        )
+        for i in range(activities)
+    ])
+
+    created_events = Event.objects.bulk_create([
+        Event(
+            proyecto=project,
+            name=f"Evento {i}",
+            start_date=start + timedelta(days=i % 365),
+            end_date=start + timedelta(days=i % 365),
+            responsible_area="Apropiación social de conocimiento",
+            expected_participants=attendances_per_event or 1,
+            location=Event.LocationChoices.BOGOTA,
+            activity_type=Event.ActivityTypeChoices.WORKSHOP,
+        )
+        for i in range(events)
+    ])
+
+    participant_pool = max(1, int(attendances_per_event * 1.5))
+    attendances = []
+    for event in created_events:
+        for j in rng.sample(range(participant_pool), min(attendances_per_event, participant_pool)):
+            row = {field: rng.randint(1, 5) for field in SATISFACTION_FIELDS}
+            attendances.append(Attendance(
+                event=event,
+                accepts_data_processing=True,
+                name=f"Participante {j}",
+                email=f"participante{j}@example.org",
+                participant_key=f"participante{j}@example.org",
+                wiki_username=f"Participante{j}" if j % 2 else "",
+                department=rng.choice(departments),
+                attendance_mode=Attendance.AttendanceModeChoices.PRESENTIAL,
+                activity_incidence=rng.choice(incidences),
+                learned_new_aspect="Aprendí a editar artículos y a citar fuentes.",
+                interesting_aspect_discuss="Las licencias libres.",
+                future_participation=Attendance.FutureParticipationChoices.YES,
+                feedback_improvements="Más tiempo para practicar.",
+                **row,
+            ))
+    link_participants(attendances)
+    Attendance.objects.bulk_create(attendances, batch_size=500)
+    # bulk_create skips the signals that keep the per-event stats current
+    refresh_all_event_attendance_stats()
+
+    return project
+
+
+def benchmark_generator(generator_class, model, pk, repeat=3):
+    """
+    Generate the report for one instance ``repeat`` times.
+
+    The instance is re-fetched on every run so prefetched rows are not reused.
+
+    Returns:
+        dict: Median/min wall time, queries and memory of the runs
+    """
+    timings = []
+    profile = None
+    for _ in range(repeat):
+        generator = generator_class(model.objects.get(pk=pk))
+        generator.generate_excel()
+        profile = generator.profile
+        timings.append(profile.total_ms)
+
+    return {
+        "generator": generator_class.__name__,
+        "instance_id": pk,
+        "runs": repeat,
+        "wall_ms_median": round(statistics.median(timings), 2),
+        "wall_ms_min": round(min(timings), 2),
+        "queries": profile.total_queries,
+        "peak_rss_kb": profile.peak_rss_kb,
+        "peak_memory_bytes": profile.peak_memory_bytes,
+        "spans": profile.spans,
+    }
+
+
+def run_report_benchmarks(events=10, activities=10, attendances_per_event=30, repeat=3, seed=0):
+    """
+    Create a synthetic project and benchmark the project, event and activity generators.
+
+    Returns:
+        list: One result dictionary per generator
+    """
+    project = create_synthetic_project(
+        events=events,
+        activities=activities,
+        attendances_per_event=attendances_per_event,
+        seed=seed,
+    )
+    results = [benchmark_generator(ProjectReportGenerator, Project, project.pk, repeat)]
+
+    event = project.events.order_by("pk").first()
+    if event is not None:
+        results.append(benchmark_generator(EventReportGenerator, Event, event.pk, repeat))
+
+    activity = project.activities.order_by("pk").first()
+    if activity is not None:
+        results.append(benchmark_generator(ActivityReportGenerator, Activity, activity.pk, repeat))
+
+    return results
+
+
+def compare_with_baseline(results, baseline, tolerance=0.25):
+    """
+    Compare benchmark results with a previous run.
+
+    Args:
+        results: Output of run_report_benchmarks()
+        baseline: Previously saved results (same shape)
+        tolerance: Allowed relative slowdown of the median wall time
+
+    Returns:
+        list: Human-readable regression messages (empty if none)
+    """
+    previous = {row["generator"]: row for row in baseline}
+    regressions = []
+    for row in results:
+        before = previous.get(row["generator"])
+        if before is None:
+            continue
+        if row["queries"] > before["queries"]:
+            regressions.append(
+                f"{row['generator']}: consultas {before['queries']} -> {row['queries']}"
+            )
+        limit = before["wall_ms_median"] * (1 + tolerance)
+        if row["wall_ms_median"] > limit:
+            regressions.append(
+                f"{row['generator']}: tiempo {before['wall_ms_median']} ms -> "
+                f"{row['wall_ms_median']} ms (límite {limit:.1f} ms)"
+            )
+    return regressions
+
+
+# Run in a fresh interpreter: times what a worker does before its first request
+STARTUP_SCRIPT = """\
+import json, time
+start = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+wall_ms = (time.perf_counter() - start) * 1000
+from django.conf import settings
+print(json.dumps({"wall_ms": wall_ms, "apps": len(settings.INSTALLED_APPS), "middleware": len(settings.MIDDLEWARE)}))
+"""
+
+
+def load_application(dev_tools):
+    """
+    Load the WSGI application once in a new process with DEBUG off.
+
+    Args:
+        dev_tools: Value of DJANGO_DEV_TOOLS for the run
+
+    Returns:
+        dict: Load time in milliseconds and the number of apps and middleware
+    """
+    env = {key: value for key, value in os.environ.items() if key != "NPM_BIN_PATH"}
+    env.update(
+        DJANGO_SETTINGS_MODULE="wikimediacolombiasara.settings",
+        DJANGO_DEBUG="false",
+        DJANGO_DEV_TOOLS="true" if dev_tools else "false",
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", STARTUP_SCRIPT],
+        capture_output=True, text=True, env=env, check=True, cwd=settings.BASE_DIR,
+    )
+    return json.loads(result.stdout)
+
+
+def run_startup_benchmarks(repeat=5):
+    """
+    Compare loading the application with and without the development tooling,
+    ``repeat`` times each.
+
+    With DEBUG off the live-reload middleware does nothing per request, so what
+    DJANGO_DEV_TOOLS changes is the apps and middleware each worker imports and
+    initializes at startup.
+
+    Returns:
+        list: One result dictionary per profile ('development', 'production')
+    """
+    profiles = (("development", True), ("production", False))
+    runs = {profile: [] for profile, _ in profiles}
+    # Alternate the profiles so disk caches warm up for both alike
+    for _ in range(repeat):
+        for profile, dev_tools in profiles:
+            runs[profile].append(load_application(dev_tools))
+    results = []
+    for profile, _ in profiles:
+        timings = [run["wall_ms"] for run in runs[profile]]
+        results.append({
+            "profile": profile,
+            "apps": runs[profile][0]["apps"],
+            "middleware": runs[profile][0]["middleware"],
+            "runs": repeat,
+            "wall_ms_median": round(statistics.median(timings), 3),
+            "wall_ms_min": round(min(timings), 3),
+        })
+    return results
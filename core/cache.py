@@ -0,0 +1,121 @@
+"""
+Namespaced, versioned keys and tag invalidation on top of Django's cache.
+
+Each feature keeps its entries under a ``CacheNamespace``::
+
+    analytics_cache = CacheNamespace("survey-analytics", version=1)
+    analytics_cache.get_or_set(("event", 7), compute, timeout=300, tags=["event:7"])
+    invalidate_tags("event:7")
+
+Keys look like ``survey-analytics:v1:event:7`` (plus the backend's
+``KEY_PREFIX``). Bumping a namespace's ``version`` when the cached data
+changes shape makes every process ignore the old entries.
+
+A tag names something the cached data was computed from. Every tag has a
+token stored in the cache; entries remember the tokens of their tags when they
+are written, and ``invalidate_tags()`` replaces the tokens, so every entry
+tagged with them becomes a miss without having to know its key. This works the
+same with the per-process, file and Redis backends (see ``CACHES`` in
+settings), though with locmem each process only sees its own invalidations.
+
+``count_hit()`` counts requests in fixed time windows, for rate limits.
+"""
+import time
+import uuid
+
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+TAG_KEY_PREFIX = "tag"
+RATE_KEY_PREFIX = "rate"
+
+_MISSING = object()
+
+
+def _tag_key(tag):
+    return f"{TAG_KEY_PREFIX}:{tag}"
+
+
+def _current_tokens(tags, create=False):
+    """
+    Return {tag: token} for the given tags. Tags without a token get a new one
+    when ``create`` is true and are left out otherwise.
+    """
+    if not tags:
+        return {}
+    keys = {_tag_key(tag): tag for tag in tags}
+    tokens = {keys[key]: token for key, token in cache.get_many(keys).items()}
+    if create:
+        for tag in set(tags) - tokens.keys():
+            # add() keeps a token another process created in the meantime
+            cache.add(_tag_key(tag), uuid.uuid4().hex, timeout=None)
+            tokens[tag] = cache.get(_tag_key(tag))
+    return tokens
+
+
+def invalidate_tags(*tags):
+    """Expire every cached entry tagged with any of the given tags."""
+    cache.set_many({_tag_key(tag): uuid.uuid4().hex for tag in tags}, timeout=None)
+
+
+def count_hit(key, window):
+    """
+    Count a hit for ``key`` in the current window of ``window`` seconds.
+
+    Returns:
+        int: Hits in the window so far, this one included
+    """
+    bucket = f"{RATE_KEY_PREFIX}:{key}:{int(time.time() // window)}"
+    if cache.add(bucket, 1, timeout=window):
+        return 1
+    try:
+        return cache.incr(bucket)
+    except ValueError:
+        # Expired between add() and incr()
+        cache.add(bucket, 1, timeout=window)
+        return 1
+
+
+class CacheNamespace:
+    """
+    The cached entries of one feature.
+
+    Args:
+        name: Prefix of the feature's keys
+        version: Bump it when the cached values change format
+    """
+
+    def __init__(self, name, version=1):
+        self.name = name
+        self.version = version
+
+    def make_key(self, key):
+        """'<name>:v<version>:<key>'; tuple keys are joined with ':'."""
+        parts = key if isinstance(key, tuple) else (key,)
+        return ":".join([self.name, f"v{self.version}", *(str(part) for part in parts)])
+
+    def get(self, key, default=None):
+        entry = cache.get(self.make_key(key))
+        if entry is None:
+            return default
+        tokens, value = entry
+        if tokens and _current_tokens(tokens) != tokens:
+            return default
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, tags=()):
+        """Store a value; it becomes a miss once any of ``tags`` is invalidated."""
+        cache.set(self.make_key(key), (_current_tokens(tags, create=True), value), timeout)
+
+    def get_or_set(self, key, compute, timeout=DEFAULT_TIMEOUT, tags=()):
+        """Return the cached value, or call ``compute()`` and cache its result."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            # Read the tokens first: an invalidation while computing must win
+            tokens = _current_tokens(tags, create=True)
+            value = compute()
+            cache.set(self.make_key(key), (tokens, value), timeout)
+        return value
+
+    def delete(self, *keys):
+        cache.delete_many([self.make_key(key) for key in keys])
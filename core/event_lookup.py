@@ -0,0 +1,106 @@
+"""
+Cached lookup of the event behind a public attendance link.
+
+Every step of the attendance wizard needs the event of its token. The few
+fields the wizard uses (``WIZARD_EVENT_FIELDS``) are kept in a small
+per-process LRU and in the shared cache (``core.cache``), so an attendee going
+through the five steps does not read the same event row on every request.
+
+Saving or deleting an event clears its entry from the shared cache and from
+the LRU of the process that made the change (see core/signals.py). Other
+processes drop their copy after ``ATTENDANCE_EVENT_LOCAL_CACHE_TIMEOUT``
+seconds.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models import DEFERRED
+from django.http import Http404
+
+from .cache import CacheNamespace
+from .models import Event
+
+LOCAL_CACHE_SIZE = 512
+
+# Fields the attendance wizard templates and the registration itself use
+WIZARD_EVENT_FIELDS = ("id", "name", "attendance_token", "start_date", "end_date", "proyecto_id")
+
+# Bump the version when WIZARD_EVENT_FIELDS changes
+event_cache = CacheNamespace("attendance-event", version=1)
+
+_local = OrderedDict()
+_local_lock = threading.Lock()
+
+
+def _local_get(key):
+    with _local_lock:
+        entry = _local.get(key)
+        if entry is None:
+            return None
+        expires, values = entry
+        if expires < time.monotonic():
+            del _local[key]
+            return None
+        _local.move_to_end(key)
+        return values
+
+
+def _local_set(key, values):
+    with _local_lock:
+        _local[key] = (time.monotonic() + settings.ATTENDANCE_EVENT_LOCAL_CACHE_TIMEOUT, values)
+        _local.move_to_end(key)
+        while len(_local) > LOCAL_CACHE_SIZE:
+            _local.popitem(last=False)
+
+
+def _build_event(values):
+    """An Event with only the wizard fields loaded; others are read on access."""
+    loaded = dict(zip(WIZARD_EVENT_FIELDS, values))
+    fields = Event._meta.concrete_fields
+    return Event.from_db(
+        "default",
+        [field.attname for field in fields],
+        [loaded.get(field.attname, DEFERRED) for field in fields],
+    )
+
+
+def get_attendance_event_or_404(attendance_token):
+    """
+    Return the event of an attendance link, from the caches when possible.
+
+    Raises:
+        Http404: If no event has this token
+    """
+    key = str(attendance_token)
+    values = _local_get(key)
+    if values is None:
+        values = event_cache.get(key)
+        if values is None:
+            values = (
+                Event.objects.filter(attendance_token=attendance_token)
+                .values_list(*WIZARD_EVENT_FIELDS)
+                .first()
+            )
+            if values is None:
+                raise Http404("No Event matches the given query.")
+            event_cache.set(key, values, settings.ATTENDANCE_EVENT_CACHE_TIMEOUT)
+        _local_set(key, values)
+    return _build_event(values)
+
+
+def invalidate(attendance_token):
+    """Forget the cached event of an attendance link."""
+    if attendance_token is None:
+        return
+    key = str(attendance_token)
+    with _local_lock:
+        _local.pop(key, None)
+    event_cache.delete(key)
+
+
+def clear_local_cache():
+    """Empty this process's LRU (tests, or after bulk event changes)."""
+    with _local_lock:
+        _local.clear()
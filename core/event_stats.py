@@ -0,0 +1,106 @@
+"""
+Per-event attendance statistics stored on ``Event``.
+
+``attendance_count``, ``department_count`` and ``average_satisfaction`` let the
+event list, the event detail modal and the reports show attendance figures
+without aggregating ``Attendance`` rows on every read.
+
+``refresh_event_attendance_stats()`` recomputes them from the stored rows with
+one aggregate query and one ``QuerySet.update()``; ``Event.save()`` leaves them
+out. It is called after an attendance is saved or deleted (see core/signals.py).
+A plain ``Attendance.save()`` has already committed its INSERT by then, so the
+refresh opens its own transaction; ``bulk_insert_attendances()`` calls it inside
+the insert's transaction. Either way concurrent refreshes of one event are
+serialized and, as each one recounts every committed attendance, the last one
+stores the right figures: PostgreSQL and MySQL lock the event row
+(``select_for_update``), and on SQLite, where that is a no-op, the transaction
+already holds the database write lock from its start
+(``transaction_mode = 'IMMEDIATE'`` in settings). Code that writes attendances
+with ``bulk_create`` or raw SQL must call it explicitly.
+"""
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+
+from .models import Attendance, Event
+
+SATISFACTION_FIELDS = (
+    "satisfaction_methodology",
+    "satisfaction_session_usefulness",
+    "satisfaction_schedule_timing",
+    "satisfaction_logistics",
+    "satisfaction_activity_usefulness",
+)
+
+
+def compute_event_attendance_stats(event_ids):
+    """
+    Aggregate the attendance statistics of several events in one query.
+
+    Returns:
+        dict: {event_id: {stats field: value}}; events without attendances
+        get zeros
+    """
+    event_ids = list(event_ids)
+    score_sum = sum((F(field) for field in SATISFACTION_FIELDS[1:]), F(SATISFACTION_FIELDS[0]))
+    rows = (
+        Attendance.objects.filter(event_id__in=event_ids)
+        .values("event_id")
+        .annotate(
+            total=Count("pk"),
+            departments=Count("department", distinct=True, filter=~Q(department="")),
+            score_total=Sum(score_sum),
+        )
+        .order_by()
+    )
+
+    stats = {
+        event_id: {"attendance_count": 0, "department_count": 0, "average_satisfaction": 0}
+        for event_id in event_ids
+    }
+    for row in rows:
+        total = row["total"]
+        stats[row["event_id"]] = {
+            "attendance_count": total,
+            "department_count": row["departments"],
+            # Mean of each attendance's average of the five items
+            "average_satisfaction": round(
+                row["score_total"] / (total * len(SATISFACTION_FIELDS)), 2
+            ) if total else 0,
+        }
+    return stats
+
+
+def refresh_event_attendance_stats(event_id):
+    """
+    Recompute and store the attendance statistics of one event.
+
+    Returns:
+        dict: The stored values
+    """
+    with transaction.atomic():
+        # Serialize concurrent refreshes of the same event (a no-op on SQLite,
+        # whose IMMEDIATE transactions are serialized already)
+        if not Event.objects.select_for_update().filter(pk=event_id).exists():
+            return None
+        stats = compute_event_attendance_stats([event_id])[event_id]
+        Event.objects.filter(pk=event_id).update(**stats)
+    return stats
+
+
+def refresh_all_event_attendance_stats(batch_size=500):
+    """
+    Recompute the statistics of every event, e.g. after bulk imports.
+
+    Returns:
+        int: Number of events updated
+    """
+    event_ids = list(Event.objects.values_list("pk", flat=True))
+    for start in range(0, len(event_ids), batch_size):
+        batch = event_ids[start:start + batch_size]
+        stats = compute_event_attendance_stats(batch)
+        with transaction.atomic():
+            Event.objects.bulk_update(
+                [Event(pk=event_id, **values) for event_id, values in stats.items()],
+                fields=list(Event.STATS_FIELDS),
+            )
+    return len(event_ids)
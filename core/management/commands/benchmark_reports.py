@@ -0,0 +1,85 @@
+"""
+Benchmark the report generators against synthetic data.
+
+Runs in a throwaway database (a temporary SQLite file by default), so it never
+touches real data::
+
+    python manage.py benchmark_reports --events 50 --attendances 100 --output bench.json
+    python manage.py benchmark_reports --baseline bench.json   # fails on regressions
+"""
+import json
+import os
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from core.benchmarks import compare_with_baseline, run_report_benchmarks
+
+
+class Command(BaseCommand):
+    help = "Mide tiempo, consultas y memoria de los generadores de reportes con datos sintéticos."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--events", type=int, default=20, help="Eventos del proyecto sintético.")
+        parser.add_argument("--activities", type=int, default=20, help="Actividades del proyecto sintético.")
+        parser.add_argument("--attendances", type=int, default=50, help="Asistencias por evento.")
+        parser.add_argument("--repeat", type=int, default=3, help="Repeticiones por generador.")
+        parser.add_argument("--seed", type=int, default=0, help="Semilla de los datos sintéticos.")
+        parser.add_argument("--output", help="Guarda los resultados en este archivo JSON.")
+        parser.add_argument("--baseline", help="Compara con resultados JSON previos y falla si hay regresiones.")
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.25,
+            help="Aumento relativo de tiempo permitido frente al baseline (default: 0.25).",
+        )
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options["baseline"]:
+            with open(options["baseline"], encoding="utf-8") as fh:
+                baseline = json.load(fh)
+
+        results = self._run_in_throwaway_db(options)
+
+        for row in results:
+            rss = f"{row['peak_rss_kb'] / 1024:.1f} MB" if row["peak_rss_kb"] else "n/d"
+            self.stdout.write(
+                f"{row['generator']:<26} mediana {row['wall_ms_median']:>9.1f} ms  "
+                f"mín {row['wall_ms_min']:>9.1f} ms  {row['queries']:>4} consultas  RSS pico {rss}"
+            )
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as fh:
+                json.dump(results, fh, indent=2)
+            self.stdout.write(f"Resultados guardados en {options['output']}")
+
+        if baseline is not None:
+            regressions = compare_with_baseline(results, baseline, options["tolerance"])
+            if regressions:
+                raise CommandError("Regresiones de rendimiento:\n" + "\n".join(regressions))
+            self.stdout.write(self.style.SUCCESS("Sin regresiones frente al baseline."))
+
+    def _run_in_throwaway_db(self, options):
+        """Create a temporary test database, run the benchmarks and destroy it."""
+        tmp_dir = None
+        if connection.vendor == "sqlite":
+            tmp_dir = tempfile.mkdtemp(prefix="sara-bench-")
+            connection.settings_dict.setdefault("TEST", {})
+            connection.settings_dict["TEST"]["NAME"] = os.path.join(tmp_dir, "bench.sqlite3")
+
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            return run_report_benchmarks(
+                events=options["events"],
+                activities=options["activities"],
+                attendances_per_event=options["attendances"],
+                repeat=options["repeat"],
+                seed=options["seed"],
+            )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            if tmp_dir:
+                os.rmdir(tmp_dir)
@@ -0,0 +1,32 @@
+"""
+Measure what the development tooling costs each worker at startup.
+
+Loads the WSGI application in new processes with DEBUG off, with and without
+``DJANGO_DEV_TOOLS`` (Tailwind, live reload), and prints the median time of each::
+
+    python manage.py benchmark_startup --repeat 10
+
+With DEBUG off the live-reload middleware returns responses untouched, so the
+difference is paid when a worker starts, not on each request.
+"""
+from django.core.management.base import BaseCommand
+
+from core.benchmarks import run_startup_benchmarks
+
+
+class Command(BaseCommand):
+    help = "Mide el tiempo de carga de la aplicación con y sin las herramientas de desarrollo."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=5, help="Procesos por perfil.")
+
+    def handle(self, *args, **options):
+        results = run_startup_benchmarks(options["repeat"])
+        for row in results:
+            self.stdout.write(
+                f"{row['profile']:<12} {row['apps']:>2} apps  {row['middleware']:>2} middleware  "
+                f"mediana {row['wall_ms_median']:>8.1f} ms  mín {row['wall_ms_min']:>8.1f} ms"
+            )
+        development, production = results
+        saved = development["wall_ms_median"] - production["wall_ms_median"]
+        self.stdout.write(f"Diferencia al arrancar: {saved:.1f} ms por proceso")
@@ -0,0 +1,85 @@
+"""
+Management command that inserts spooled attendance registrations.
+
+With ``ATTENDANCE_INGESTION=spool`` the attendance wizard writes each
+registration to ``ATTENDANCE_SPOOL_DIR``; run this as a long-lived process next
+to the web workers (e.g. a Toolforge continuous job)::
+
+    python manage.py drain_attendance_spool
+
+Use ``--once`` to drain the spool and exit. A batch that fails with a database
+error (e.g. "database is locked") goes back to the spool and is retried after
+``--poll-interval`` seconds; with ``--once`` the command stops there instead.
+"""
+import logging
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError
+
+from core.attendance_spool import claim_batch, ingest_batch, requeue_stale_claims
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Guarda en la base de datos los registros de asistencia encolados."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Procesa los registros pendientes y termina.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=200,
+            help="Registros insertados por transacción (default: 200).",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Segundos de espera cuando la cola está vacía (default: 1).",
+        )
+
+    def handle(self, *args, **options):
+        self._stopping = False
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+
+        requeued = requeue_stale_claims()
+        if requeued:
+            self.stdout.write(f"Reencolados {requeued} registros interrumpidos.")
+
+        inserted = 0
+        last_housekeeping = time.monotonic()
+        while not self._stopping:
+            paths = claim_batch(options["batch_size"])
+            if not paths:
+                if options["once"]:
+                    break
+                if time.monotonic() - last_housekeeping > 60:
+                    requeue_stale_claims()
+                    last_housekeeping = time.monotonic()
+                time.sleep(options["poll_interval"])
+                continue
+
+            try:
+                count = ingest_batch(paths)
+            except DatabaseError as exc:
+                logger.exception("Spooled attendance batch failed")
+                self.stderr.write(f"Lote devuelto a la cola por un error de base de datos: {exc}")
+                if options["once"]:
+                    break
+                time.sleep(options["poll_interval"])
+                continue
+            inserted += count
+            self.stdout.write(f"Lote: {count} de {len(paths)} registros guardados.")
+
+        self.stdout.write(self.style.SUCCESS(f"{inserted} registros de asistencia guardados."))
+
+    def _request_stop(self, signum, frame):
+        self._stopping = True
@@ -0,0 +1,20 @@
+"""
+Rebuild the monthly activity metric rollups from scratch.
+
+Saving or deleting an activity keeps its rollup row current; run this after
+bulk imports, ``bulk_create``/``update()`` calls or raw SQL, which bypass the
+model signals::
+
+    python manage.py rebuild_activity_rollups
+"""
+from django.core.management.base import BaseCommand
+
+from core.rollups import rebuild_activity_rollups
+
+
+class Command(BaseCommand):
+    help = "Recalcula la tabla de resúmenes mensuales de métricas de actividades."
+
+    def handle(self, *args, **options):
+        count = rebuild_activity_rollups()
+        self.stdout.write(self.style.SUCCESS(f"{count} resúmenes mensuales recalculados."))
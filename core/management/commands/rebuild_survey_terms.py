@@ -0,0 +1,20 @@
+"""
+Rebuild the term-frequency index of the free-text survey answers.
+
+Creating, editing or deleting an attendance keeps the index current; run this
+after bulk imports, ``bulk_create``/``update()`` calls or raw SQL, which bypass
+the model signals::
+
+    python manage.py rebuild_survey_terms
+"""
+from django.core.management.base import BaseCommand
+
+from core.survey_terms import rebuild_survey_term_index
+
+
+class Command(BaseCommand):
+    help = "Recalcula el índice de términos de las respuestas abiertas de las encuestas."
+
+    def handle(self, *args, **options):
+        count = rebuild_survey_term_index()
+        self.stdout.write(self.style.SUCCESS(f"{count} términos indexados."))
@@ -0,0 +1,80 @@
+"""
+Management command that processes queued report jobs.
+
+Run it as a long-lived process next to the web workers (e.g. a Toolforge
+continuous job)::
+
+    python manage.py run_report_worker
+
+Use ``--once`` to drain the queue and exit (useful for cron-style scheduling).
+"""
+import os
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.report_jobs import (
+    claim_next_job,
+    purge_expired_jobs,
+    requeue_stale_jobs,
+    run_report_job,
+)
+
+
+class Command(BaseCommand):
+    help = "Procesa los reportes encolados para generación en segundo plano."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Procesa los trabajos pendientes y termina.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Segundos de espera cuando la cola está vacía (default: 2).",
+        )
+        parser.add_argument(
+            "--nice",
+            type=int,
+            default=10,
+            help="Incremento de prioridad 'nice' del proceso para no competir con el tráfico web (default: 10).",
+        )
+
+    def handle(self, *args, **options):
+        self._stopping = False
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+
+        if options["nice"] and hasattr(os, "nice"):
+            os.nice(options["nice"])
+
+        requeued = requeue_stale_jobs()
+        if requeued:
+            self.stdout.write(f"Reencolados {requeued} trabajos interrumpidos.")
+
+        processed = 0
+        last_housekeeping = time.monotonic()
+        while not self._stopping:
+            job = claim_next_job()
+            if job is None:
+                if options["once"]:
+                    break
+                if time.monotonic() - last_housekeeping > 60:
+                    requeue_stale_jobs()
+                    purge_expired_jobs()
+                    last_housekeeping = time.monotonic()
+                time.sleep(options["poll_interval"])
+                continue
+
+            job = run_report_job(job)
+            processed += 1
+            self.stdout.write(f"Trabajo {job.pk}: {job.get_status_display()}")
+
+        self.stdout.write(self.style.SUCCESS(f"{processed} trabajos procesados."))
+
+    def _request_stop(self, signum, frame):
+        self._stopping = True
@@ -0,0 +1,56 @@
+"""
+Checkpoint, optimize and compact the SQLite database.
+
+In WAL mode, committed pages accumulate in ``db.sqlite3-wal`` until a
+checkpoint copies them into the database file. SQLite checkpoints
+automatically, but only when no reader is in the way. Run this in a quiet
+moment (e.g. a daily Toolforge job) to move everything into the main file,
+truncate the WAL, refresh the query planner statistics and reclaim the space
+of deleted rows::
+
+    python manage.py sqlite_maintenance
+    python manage.py sqlite_maintenance --skip-vacuum
+
+VACUUM rewrites the whole file and briefly blocks writers; skip it on busy
+hours.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+
+class Command(BaseCommand):
+    help = "Aplica el WAL, actualiza las estadísticas y compacta la base de datos SQLite."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--skip-vacuum",
+            action="store_true",
+            help="Solo hace el checkpoint y actualiza las estadísticas, sin VACUUM.",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("La base de datos configurada no es SQLite.")
+
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            busy, wal_pages, checkpointed = cursor.fetchone()
+            if busy:
+                self.stdout.write(self.style.WARNING(
+                    "Checkpoint incompleto: otra conexión está leyendo o escribiendo."
+                ))
+            else:
+                self.stdout.write(f"Checkpoint: {checkpointed} de {wal_pages} páginas del WAL aplicadas.")
+
+            cursor.execute("PRAGMA optimize")
+            self.stdout.write("Estadísticas del planificador actualizadas.")
+
+            if not options["skip_vacuum"]:
+                cursor.execute("PRAGMA page_count")
+                before = cursor.fetchone()[0]
+                cursor.execute("VACUUM")
+                cursor.execute("PRAGMA page_count")
+                after = cursor.fetchone()[0]
+                self.stdout.write(f"VACUUM: {before} -> {after} páginas.")
+
+        self.stdout.write(self.style.SUCCESS("Mantenimiento de SQLite terminado."))
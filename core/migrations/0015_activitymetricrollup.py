@@ -0,0 +1,91 @@
+# Generated by Django 5.2.11 on 2026-10-19 01:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+METRIC_FIELDS = (
+    "participants",
+    "reached_people",
+    "created_content",
+    "open_educational_resources",
+    "products",
+    "participating_institutions",
+    "strategic_partnerships",
+    "stories",
+    "sustainability",
+    "editor_count",
+    "event_participation",
+)
+
+
+def backfill_rollups(apps, schema_editor):
+    Activity = apps.get_model("core", "Activity")
+    ActivityMetricRollup = apps.get_model("core", "ActivityMetricRollup")
+    rows = (
+        Activity.objects.annotate(month=TruncMonth("date"))
+        .values("month", "project_id", "area")
+        .annotate(
+            total_activity_count=Count("pk"),
+            **{f"total_{field}": Sum(field) for field in METRIC_FIELDS},
+        )
+        .order_by()
+    )
+    ActivityMetricRollup.objects.bulk_create(
+        [
+            ActivityMetricRollup(
+                month=row["month"],
+                project_id=row["project_id"],
+                area=row["area"],
+                activity_count=row["total_activity_count"],
+                **{field: row[f"total_{field}"] or 0 for field in METRIC_FIELDS},
+            )
+            for row in rows
+        ],
+        batch_size=500,
+    )
+
+
+def noop_reverse(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_reportjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityMetricRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='Primer día del mes.', verbose_name='Mes')),
+                ('area', models.CharField(blank=True, choices=[('ASC', 'Apropiación social de conocimiento'), ('TC', 'Tecnologías y comunidades'), ('DA', 'Dirección Administrativa')], max_length=3, verbose_name='Área de la actividad')),
+                ('activity_count', models.PositiveIntegerField(default=0, verbose_name='Actividades')),
+                ('participants', models.PositiveIntegerField(default=0, verbose_name='Participantes')),
+                ('reached_people', models.PositiveIntegerField(default=0, verbose_name='Personas alcanzadas indirectamente')),
+                ('created_content', models.PositiveIntegerField(default=0, verbose_name='Contenidos creados')),
+                ('open_educational_resources', models.PositiveIntegerField(default=0, verbose_name='Recursos educativos abiertos')),
+                ('products', models.PositiveIntegerField(default=0, verbose_name='Productos')),
+                ('participating_institutions', models.PositiveIntegerField(default=0, verbose_name='Instituciones participantes')),
+                ('strategic_partnerships', models.PositiveIntegerField(default=0, verbose_name='Alianzas estratégicas')),
+                ('stories', models.PositiveIntegerField(default=0, verbose_name='Historias sobre soluciones y desafíos')),
+                ('sustainability', models.PositiveIntegerField(default=0, verbose_name='Sostenibilidad')),
+                ('editor_count', models.PositiveIntegerField(default=0, verbose_name='Número total de editores')),
+                ('event_participation', models.PositiveIntegerField(default=0, verbose_name='Participación en eventos')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='metric_rollups', to='core.project', verbose_name='Proyecto')),
+            ],
+            options={
+                'verbose_name': 'Resumen mensual de métricas',
+                'verbose_name_plural': 'Resúmenes mensuales de métricas',
+                'ordering': ['month', 'project', 'area'],
+                'indexes': [models.Index(fields=['area', 'month'], name='core_activityrollup_area_idx'), models.Index(fields=['project', 'month'], name='core_activityrollup_proj_idx')],
+                'constraints': [models.UniqueConstraint(fields=('month', 'project', 'area'), name='core_activityrollup_bucket_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, noop_reverse),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.11 on 2026-10-19 01:28
+
+from django.db import migrations, models
+from django.db.models import Count, F, Q, Sum
+
+SATISFACTION_FIELDS = (
+    "satisfaction_methodology",
+    "satisfaction_session_usefulness",
+    "satisfaction_schedule_timing",
+    "satisfaction_logistics",
+    "satisfaction_activity_usefulness",
+)
+
+
+def backfill_event_stats(apps, schema_editor):
+    Attendance = apps.get_model("core", "Attendance")
+    Event = apps.get_model("core", "Event")
+    score_sum = sum((F(field) for field in SATISFACTION_FIELDS[1:]), F(SATISFACTION_FIELDS[0]))
+    rows = (
+        Attendance.objects.values("event_id")
+        .annotate(
+            total=Count("pk"),
+            departments=Count("department", distinct=True, filter=~Q(department="")),
+            score_total=Sum(score_sum),
+        )
+        .order_by()
+    )
+    events = [
+        Event(
+            pk=row["event_id"],
+            attendance_count=row["total"],
+            department_count=row["departments"],
+            average_satisfaction=round(row["score_total"] / (row["total"] * len(SATISFACTION_FIELDS)), 2),
+        )
+        for row in rows
+    ]
+    Event.objects.bulk_update(
+        events, ["attendance_count", "department_count", "average_satisfaction"], batch_size=500
+    )
+
+
+def noop_reverse(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_activitymetricrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='attendance_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Participantes registrados'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='average_satisfaction',
+            field=models.FloatField(default=0, editable=False, verbose_name='Aceptabilidad promedio'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='department_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Departamentos representados'),
+        ),
+        migrations.RunPython(backfill_event_stats, noop_reverse),
+    ]
@@ -0,0 +1,94 @@
+# Generated by Django 5.2.11 on 2026-10-19 01:35
+
+import django.db.models.deletion
+import re
+import unicodedata
+from collections import Counter, defaultdict
+
+from django.db import migrations, models
+
+FREE_TEXT_FIELDS = (
+    "learned_new_aspect",
+    "interesting_aspect_discuss",
+    "activity_incidence_other",
+    "feedback_improvements",
+)
+
+# Tokenizer of core/survey_terms.py at the time of this migration
+TOKEN_RE = re.compile(r"[^\W\d_]{3,}")
+MAX_TERM_LENGTH = 64
+
+STOPWORDS = frozenset("""
+    algo algun alguna algunas alguno algunos ante antes aquel aquella aquellas
+    aquello aquellos aqui aquí asi así aun aún cada casi como cómo con contra cual
+    cuál cuales cuando cuándo cuanto del desde donde dónde durante ella ellas ello
+    ellos entre era eran eres esa esas ese eso esos esta está estaba estaban estado
+    estamos estan están estar estas estás este esto estos estoy fue fueron fui gran
+    había habia han has hasta hay hace hacer hizo las les los mas más mayor mejor
+    menos mia mía mio mío mis mismo mucha muchas mucho muchos muy nada nos nosotras
+    nosotros nuestra nuestras nuestro nuestros otra otras otro otros para pero poco
+    por porque puede pueden puedo que qué quien quién quienes ser será sería sido
+    sin sobre sólo solo son soy sus tal también tambien tan tanto tener tengo tiene
+    tienen toda todas todo todos tras tus una uno unos usted ustedes vez ver vos
+    the and for
+""".split())
+
+
+def count_terms(texts):
+    counts = Counter()
+    for text in texts:
+        if not text:
+            continue
+        text = unicodedata.normalize("NFC", text).lower()
+        counts.update(
+            term for term in TOKEN_RE.findall(text)
+            if term not in STOPWORDS and len(term) <= MAX_TERM_LENGTH
+        )
+    return counts
+
+
+def backfill_survey_terms(apps, schema_editor):
+    Attendance = apps.get_model("core", "Attendance")
+    SurveyTermFrequency = apps.get_model("core", "SurveyTermFrequency")
+    counts = defaultdict(Counter)
+    rows = Attendance.objects.values_list("event_id", *FREE_TEXT_FIELDS)
+    for event_id, *texts in rows.iterator(chunk_size=2000):
+        counts[event_id].update(count_terms(texts))
+    SurveyTermFrequency.objects.bulk_create(
+        [
+            SurveyTermFrequency(event_id=event_id, term=term, count=count)
+            for event_id, terms in counts.items()
+            for term, count in terms.items()
+        ],
+        batch_size=1000,
+    )
+
+
+def noop_reverse(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_event_attendance_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SurveyTermFrequency',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64, verbose_name='Término')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Frecuencia')),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='survey_terms', to='core.event', verbose_name='Evento')),
+            ],
+            options={
+                'verbose_name': 'Frecuencia de término',
+                'verbose_name_plural': 'Frecuencias de términos',
+                'ordering': ['event', '-count', 'term'],
+                'constraints': [models.UniqueConstraint(fields=('event', 'term'), name='core_surveyterm_event_term_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_survey_terms, noop_reverse),
+    ]
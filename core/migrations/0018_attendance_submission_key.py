@@ -0,0 +1,18 @@
+# Generated by Django 5.2.11 on 2026-10-19 01:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_survey_term_frequency'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attendance',
+            name='submission_key',
+            field=models.UUIDField(blank=True, editable=False, help_text='Generada por el formulario sin conexión para descartar envíos repetidos.', null=True, unique=True, verbose_name='Clave de envío'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.11 on 2026-10-19 02:10
+
+from django.db import migrations, models
+
+
+def normalize(email, wiki_username):
+    email = (email or "").strip().lower()
+    if email:
+        return email
+    username = (wiki_username or "").strip().replace("_", " ").lower()
+    return f"wiki:{username}" if username else None
+
+
+def backfill_participant_keys(apps, schema_editor):
+    """
+    Key every attendance but the later copies of a duplicated registration,
+    which keep an empty key so the unique constraint can be added without
+    deleting any survey answers.
+    """
+    Attendance = apps.get_model("core", "Attendance")
+    seen = set()
+    updates = []
+    rows = Attendance.objects.order_by("created_at", "pk").values_list("pk", "event_id", "email", "wiki_username")
+    for pk, event_id, email, wiki_username in rows.iterator(chunk_size=2000):
+        key = normalize(email, wiki_username)
+        if key is None or (event_id, key) in seen:
+            continue
+        seen.add((event_id, key))
+        updates.append(Attendance(pk=pk, participant_key=key))
+    Attendance.objects.bulk_update(updates, ["participant_key"], batch_size=500)
+
+
+def noop_reverse(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_attendance_submission_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attendance',
+            name='participant_key',
+            field=models.CharField(blank=True, editable=False, help_text='Correo normalizado (o usuario de Wikipedia) con el que se evita registrar dos veces a la misma persona en un evento.', max_length=260, null=True, verbose_name='Clave de participante'),
+        ),
+        migrations.RunPython(backfill_participant_keys, noop_reverse),
+        migrations.AddConstraint(
+            model_name='attendance',
+            constraint=models.UniqueConstraint(fields=('event', 'participant_key'), name='core_attendance_event_participant_uniq'),
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 5.2.11 on 2026-10-19 02:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def normalize(email, wiki_username):
+    email = (email or "").strip().lower()
+    if email:
+        return email
+    username = (wiki_username or "").strip().replace("_", " ").lower()
+    return f"wiki:{username}" if username else None
+
+
+def backfill_participants(apps, schema_editor):
+    """Create a participant per identity and link every attendance, duplicates included."""
+    Attendance = apps.get_model("core", "Attendance")
+    Participant = apps.get_model("core", "Participant")
+    participants = {}
+    attendance_keys = []
+    rows = Attendance.objects.order_by("created_at", "pk").values_list("pk", "email", "wiki_username")
+    for pk, email, wiki_username in rows.iterator(chunk_size=2000):
+        key = normalize(email, wiki_username)
+        if key is None:
+            continue
+        attendance_keys.append((pk, key))
+        participants.setdefault(key, Participant(
+            key=key,
+            email=(email or "").strip().lower(),
+            wiki_username=(wiki_username or "").strip(),
+        ))
+    Participant.objects.bulk_create(participants.values(), batch_size=500)
+    ids = dict(Participant.objects.values_list("key", "pk"))
+    Attendance.objects.bulk_update(
+        [Attendance(pk=pk, participant_id=ids[key]) for pk, key in attendance_keys],
+        ["participant"],
+        batch_size=500,
+    )
+
+
+def noop_reverse(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_attendance_participant_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Participant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=260, unique=True, verbose_name='Clave')),
+                ('email', models.EmailField(blank=True, max_length=254, verbose_name='Correo electrónico')),
+                ('wiki_username', models.CharField(blank=True, max_length=150, verbose_name='Usuario de Wikipedia')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Participante',
+                'verbose_name_plural': 'Participantes',
+                'ordering': ['key'],
+            },
+        ),
+        migrations.AddField(
+            model_name='attendance',
+            name='participant',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='attendances', to='core.participant', verbose_name='Participante'),
+        ),
+        migrations.RunPython(backfill_participants, noop_reverse),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['participant', 'event'], name='core_attendance_part_event_idx'),
+        ),
+    ]
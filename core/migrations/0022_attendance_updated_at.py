@@ -0,0 +1,27 @@
+# Generated by Django 5.2.11 on 2026-10-19 03:10
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def copy_created_at(apps, schema_editor):
+    Attendance = apps.get_model("core", "Attendance")
+    Attendance.objects.update(updated_at=models.F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attendance',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        # Existing rows were last written when they were created
+        migrations.RunPython(copy_created_at, migrations.RunPython.noop),
+    ]
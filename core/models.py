@@ -5,6 +5,7 @@ Defines the Event model used for the calendar and event management.
 """
 import uuid
 
+from django.conf import settings
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 
@@ -40,6 +41,11 @@ class Project(models.Model):
         verbose_name = "Proyecto"
         verbose_name_plural = "Proyectos"
         ordering = ['-start_date']
+        indexes = [
+            # Default ordering (project list, reports) and the name-sorted filters
+            models.Index(fields=['start_date'], name='core_project_start_idx'),
+            models.Index(fields=['name'], name='core_project_name_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -57,6 +63,21 @@ class Activity(models.Model):
         ('DA', 'Dirección Administrativa'),
     ]
     
+    # Numeric indicators summed by ActivityMetricRollup and the portfolio report
+    METRIC_FIELDS = (
+        'participants',
+        'reached_people',
+        'created_content',
+        'open_educational_resources',
+        'products',
+        'participating_institutions',
+        'strategic_partnerships',
+        'stories',
+        'sustainability',
+        'editor_count',
+        'event_participation',
+    )
+    
     project = models.ForeignKey('Project', on_delete=models.CASCADE, related_name='activities', verbose_name="Proyecto")
     name = models.CharField(max_length=200, verbose_name="Nombre de la actividad")
     date = models.DateField(verbose_name="Fecha de la actividad")
@@ -109,6 +130,11 @@ class Activity(models.Model):
         verbose_name = "Actividad"
         verbose_name_plural = "Actividades"
         ordering = ['-date']
+        indexes = [
+            # Activity list and reports, with and without the project filter
+            models.Index(fields=['date'], name='core_activity_date_idx'),
+            models.Index(fields=['project', 'date'], name='core_activity_proj_date_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.date})"
@@ -176,23 +202,82 @@ class Event(models.Model):
         verbose_name="Tipo de actividad"
     )
     description = models.TextField(blank=True, verbose_name="Descripción")
+
+    # Attendance statistics, maintained by core.event_stats whenever an
+    # attendance is created or deleted. Never edited directly.
+    attendance_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name="Participantes registrados"
+    )
+    department_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name="Departamentos representados"
+    )
+    average_satisfaction = models.FloatField(
+        default=0, editable=False, verbose_name="Aceptabilidad promedio"
+    )
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    STATS_FIELDS = ('attendance_count', 'department_count', 'average_satisfaction')
+
     class Meta:
         verbose_name = "Evento"
         verbose_name_plural = "Eventos"
         ordering = ['start_date']
+        indexes = [
+            # Event list ordering and the calendar's date-range overlap
+            models.Index(fields=['start_date', 'end_date'], name='core_event_dates_idx'),
+            models.Index(fields=['proyecto', 'start_date'], name='core_event_proj_start_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.start_date.strftime('%d/%m/%Y')}"
 
+    def save(self, *args, **kwargs):
+        # Attendance statistics are only written by core/event_stats.py, with
+        # QuerySet.update(), so saving a loaded event (e.g. from the edit form)
+        # does not overwrite a refresh made since it was loaded. An event whose
+        # row is gone is still inserted with every field.
+        if (
+            not self._state.adding
+            and not kwargs.get("force_insert")
+            and kwargs.get("update_fields") is None
+            and Event.objects.filter(pk=self.pk).exists()
+        ):
+            kwargs["update_fields"] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.STATS_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
     @property
     def duration_days(self):
         """Return the event duration in days (inclusive of start and end date)."""
         return (self.end_date - self.start_date).days + 1
 
 
+class Participant(models.Model):
+    """
+    A person who registered attendance to one or more events, identified by
+    Attendance.participant_key (lower-cased email, or Wikipedia username).
+    Attendances are linked on insert, so cross-event metrics group by
+    participant instead of comparing identifiers.
+    """
+
+    key = models.CharField(max_length=260, unique=True, verbose_name="Clave")
+    email = models.EmailField(blank=True, verbose_name="Correo electrónico")
+    wiki_username = models.CharField(max_length=150, blank=True, verbose_name="Usuario de Wikipedia")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Participante"
+        verbose_name_plural = "Participantes"
+        ordering = ["key"]
+
+    def __str__(self):
+        return self.wiki_username or self.email or self.key
+
+
 class Attendance(models.Model):
     """
     Event attendance record: consent, contact, demographics, acceptability (five 1–5 items),
@@ -336,16 +421,82 @@ class Attendance(models.Model):
         blank=True,
         verbose_name="Aspectos que podrían mejorarse en futuras actividades",
     )
+    submission_key = models.UUIDField(
+        null=True,
+        blank=True,
+        unique=True,
+        editable=False,
+        verbose_name="Clave de envío",
+        help_text="Generada por el formulario sin conexión para descartar envíos repetidos.",
+    )
+    participant_key = models.CharField(
+        max_length=260,
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name="Clave de participante",
+        help_text="Correo normalizado (o usuario de Wikipedia) con el que se evita registrar dos veces a la misma persona en un evento.",
+    )
+    participant = models.ForeignKey(
+        Participant,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="attendances",
+        verbose_name="Participante",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
+    # Admin edits change cached reports too (core/report_cache.py)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Open-ended survey answers, exported and indexed by core/survey_terms.py
+    FREE_TEXT_FIELDS = (
+        'learned_new_aspect',
+        'interesting_aspect_discuss',
+        'activity_incidence_other',
+        'feedback_improvements',
+    )
 
     class Meta:
         verbose_name = "Asistencia"
         verbose_name_plural = "Asistencias"
         ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["event", "participant_key"],
+                name="core_attendance_event_participant_uniq",
+            ),
+        ]
+        indexes = [
+            # Retention and cohort queries group a participant's events
+            models.Index(fields=["participant", "event"], name="core_attendance_part_event_idx"),
+            # Departments reached (home page) and per-event survey heatmaps
+            models.Index(fields=["event", "department"], name="core_attendance_event_dept_idx"),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.event.name}"
 
+    @staticmethod
+    def build_participant_key(email, wiki_username=""):
+        """
+        Normalized identity of an attendee: the lower-cased email, or the
+        Wikipedia username when there is no email. None if neither is given.
+        """
+        email = (email or "").strip().lower()
+        if email:
+            return email
+        username = (wiki_username or "").strip().replace("_", " ").lower()
+        return f"wiki:{username}" if username else None
+
+    def save(self, *args, **kwargs):
+        # Duplicates stored before the unique constraint were left without a key
+        # (migration 0019); editing one must not collide with the original.
+        if self._state.adding or self.participant_key is not None:
+            self.participant_key = self.build_participant_key(self.email, self.wiki_username)
+        super().save(*args, **kwargs)
+
     @property
     def average_satisfaction_score(self):
         """Mean of the five 1–5 acceptability items for reports and summaries."""
@@ -357,3 +508,148 @@ class Attendance(models.Model):
             self.satisfaction_activity_usefulness,
         )
         return sum(scores) / len(scores)
+
+
+class ReportJob(models.Model):
+    """
+    Background report generation request.
+
+    Jobs are queued by the reports UI and processed outside the request cycle by
+    the ``run_report_worker`` management command; the finished workbook is stored
+    on disk under ``settings.REPORT_JOBS_DIR``.
+    """
+
+    class StatusChoices(models.TextChoices):
+        PENDING = "pending", "En cola"
+        RUNNING = "running", "Generando"
+        DONE = "done", "Listo"
+        FAILED = "failed", "Error"
+
+    report_type = models.CharField(max_length=20, verbose_name="Tipo de reporte")
+    instance_id = models.PositiveIntegerField(verbose_name="ID del objeto")
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="report_jobs",
+        verbose_name="Solicitado por",
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=StatusChoices.choices,
+        default=StatusChoices.PENDING,
+        verbose_name="Estado",
+    )
+    filename = models.CharField(max_length=255, blank=True, verbose_name="Nombre del archivo")
+    file_path = models.CharField(max_length=500, blank=True, verbose_name="Ruta del archivo")
+    error = models.TextField(blank=True, verbose_name="Error")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # Refreshed by the worker while the report is generated (core/report_jobs.py)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Trabajo de reporte"
+        verbose_name_plural = "Trabajos de reporte"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="core_reportjob_status_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.report_type} #{self.instance_id} ({self.get_status_display()})"
+
+    @property
+    def is_active(self):
+        """True while the job is still waiting for or being processed by a worker."""
+        return self.status in (self.StatusChoices.PENDING, self.StatusChoices.RUNNING)
+
+
+class ActivityMetricRollup(models.Model):
+    """
+    Monthly totals of the activity metrics per project and activity area.
+
+    One row per (month, project, area) bucket, kept current by the Activity
+    save/delete signals (see core/rollups.py), so trend views and quarterly or
+    annual reports read a few indexed rows instead of summing every activity.
+    """
+
+    month = models.DateField(verbose_name="Mes", help_text="Primer día del mes.")
+    project = models.ForeignKey(
+        'Project',
+        on_delete=models.CASCADE,
+        related_name='metric_rollups',
+        verbose_name="Proyecto",
+    )
+    area = models.CharField(
+        max_length=3,
+        choices=Activity.PROGRAM_CHOICES,
+        blank=True,
+        verbose_name="Área de la actividad",
+    )
+    activity_count = models.PositiveIntegerField(default=0, verbose_name="Actividades")
+    participants = models.PositiveIntegerField(default=0, verbose_name="Participantes")
+    reached_people = models.PositiveIntegerField(default=0, verbose_name="Personas alcanzadas indirectamente")
+    created_content = models.PositiveIntegerField(default=0, verbose_name="Contenidos creados")
+    open_educational_resources = models.PositiveIntegerField(default=0, verbose_name="Recursos educativos abiertos")
+    products = models.PositiveIntegerField(default=0, verbose_name="Productos")
+    participating_institutions = models.PositiveIntegerField(default=0, verbose_name="Instituciones participantes")
+    strategic_partnerships = models.PositiveIntegerField(default=0, verbose_name="Alianzas estratégicas")
+    stories = models.PositiveIntegerField(default=0, verbose_name="Historias sobre soluciones y desafíos")
+    sustainability = models.PositiveIntegerField(default=0, verbose_name="Sostenibilidad")
+    editor_count = models.PositiveIntegerField(default=0, verbose_name="Número total de editores")
+    event_participation = models.PositiveIntegerField(default=0, verbose_name="Participación en eventos")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Resumen mensual de métricas"
+        verbose_name_plural = "Resúmenes mensuales de métricas"
+        ordering = ["month", "project", "area"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["month", "project", "area"],
+                name="core_activityrollup_bucket_uniq",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["area", "month"], name="core_activityrollup_area_idx"),
+            models.Index(fields=["project", "month"], name="core_activityrollup_proj_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.project_id} {self.area or '-'} {self.month:%Y-%m}"
+
+
+class SurveyTermFrequency(models.Model):
+    """
+    How many times a term appears in the free-text survey answers of an event.
+
+    Kept current by the Attendance save/delete signals (see core/survey_terms.py),
+    so the top themes of an event or project are read with one grouped query
+    instead of tokenizing every response.
+    """
+
+    event = models.ForeignKey(
+        'Event',
+        on_delete=models.CASCADE,
+        related_name='survey_terms',
+        verbose_name="Evento",
+    )
+    term = models.CharField(max_length=64, verbose_name="Término")
+    count = models.PositiveIntegerField(default=0, verbose_name="Frecuencia")
+
+    class Meta:
+        verbose_name = "Frecuencia de término"
+        verbose_name_plural = "Frecuencias de términos"
+        ordering = ["event", "-count", "term"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["event", "term"],
+                name="core_surveyterm_event_term_uniq",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.term} ({self.count})"
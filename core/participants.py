@@ -0,0 +1,117 @@
+"""
+Participant identity across events.
+
+Every attendance is linked on insert to the ``Participant`` of its normalized
+identity (``Attendance.build_participant_key``: lower-cased email, or the
+Wikipedia username), see ``link_participants()``. Retention, repeat attendance
+and cohorts are then GROUP BY participant queries over the
+(participant, event) index, for any set of attendances: one project, a year,
+or every event.
+"""
+from collections import Counter
+
+from django.db.models import Count, Max, Min, Q
+
+from .models import Attendance, Participant
+
+
+def link_participants(attendances):
+    """
+    Set the participant of unsaved or edited attendances, creating the missing
+    participants with one INSERT ... ON CONFLICT DO NOTHING.
+
+    Attendances without email or username are left without participant.
+    """
+    keys = [Attendance.build_participant_key(a.email, a.wiki_username) for a in attendances]
+    new = {}
+    for key, attendance in zip(keys, attendances):
+        if key is not None and key not in new:
+            new[key] = Participant(
+                key=key,
+                email=(attendance.email or "").strip().lower(),
+                wiki_username=(attendance.wiki_username or "").strip(),
+            )
+    ids = {}
+    if new:
+        Participant.objects.bulk_create(new.values(), ignore_conflicts=True)
+        ids = dict(Participant.objects.filter(key__in=list(new)).values_list("key", "pk"))
+    for key, attendance in zip(keys, attendances):
+        attendance.participant_id = ids.get(key)
+
+
+def _events_per_participant(attendances):
+    # order_by() drops Attendance's default ordering from the GROUP BY
+    return (
+        attendances.exclude(participant=None)
+        .order_by()
+        .values("participant")
+        .annotate(events=Count("event", distinct=True))
+    )
+
+
+def get_retention_rate(attendances=None):
+    """
+    Percentage of participants who attended two or more of the events.
+
+    Args:
+        attendances: Attendance queryset to measure (every attendance if None)
+
+    Returns:
+        float: Rounded to 2 decimals, or 0 if there are no participants
+    """
+    if attendances is None:
+        attendances = Attendance.objects.all()
+    totals = _events_per_participant(attendances).aggregate(
+        participants=Count("participant"),
+        repeat=Count("participant", filter=Q(events__gte=2)),
+    )
+    if not totals["participants"]:
+        return 0
+    return round(totals["repeat"] / totals["participants"] * 100, 2)
+
+
+def get_repeat_attendance(attendances=None):
+    """
+    How many participants attended one event, two events, and so on.
+
+    Returns:
+        list: [{'events': int, 'participants': int}, ...] by number of events
+    """
+    if attendances is None:
+        attendances = Attendance.objects.all()
+    counts = Counter(_events_per_participant(attendances).values_list("events", flat=True))
+    return [{"events": events, "participants": counts[events]} for events in sorted(counts)]
+
+
+def get_cohort_retention(attendances=None):
+    """
+    Participants grouped by the year of their first event, with how many came
+    back to an event in a later year.
+
+    Returns:
+        list: [{'year', 'participants', 'returned', 'rate'}, ...] by year
+    """
+    if attendances is None:
+        attendances = Attendance.objects.all()
+    rows = (
+        attendances.exclude(participant=None)
+        .order_by()
+        .values("participant")
+        .annotate(first=Min("event__start_date"), last=Max("event__start_date"))
+        .values_list("first", "last")
+    )
+    participants = Counter()
+    returned = Counter()
+    for first, last in rows:
+        participants[first.year] += 1
+        if last.year > first.year:
+            returned[first.year] += 1
+    return [
+        {
+            "year": year,
+            "participants": participants[year],
+            "returned": returned[year],
+            "rate": round(returned[year] / participants[year] * 100, 2),
+        }
+        for year in sorted(participants)
+    ]
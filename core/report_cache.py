@@ -0,0 +1,173 @@
+"""
+Content-addressed disk cache for generated report files.
+
+The same project and event reports are downloaded many times by different
+staff members. Each generated file is stored under a key derived from the
+report type, instance, output format, generator version and a freshness stamp
+(latest ``updated_at`` and row counts of the instance and its
+related events, activities and attendances). Any edit, insert or delete changes
+the stamp, so stale files are never served and need no explicit invalidation.
+
+The cache directory is capped at ``settings.REPORT_CACHE_MAX_BYTES``; the least
+recently used files are evicted first (hits refresh the file's mtime), but never
+the file being written. Another process may still evict a file between
+``get()`` and opening it, so callers must handle it disappearing.
+"""
+import hashlib
+import logging
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.db.models import Count, Max
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILE_SUFFIX = ".report"
+
+
+def get_cache_dir() -> Path:
+    """Return the cache directory, creating it if needed."""
+    cache_dir = Path(settings.REPORT_CACHE_DIR)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+def _aggregate_stamp(queryset, date_field):
+    """Return (latest date, row count) for a queryset in a single query."""
+    result = queryset.aggregate(latest=Max(date_field), total=Count("pk"))
+    latest = result["latest"].isoformat() if result["latest"] else ""
+    return f"{latest}/{result['total']}"
+
+
+def get_freshness_stamp(report_type, instance) -> str:
+    """
+    Build a string that changes whenever the data shown in the report changes.
+
+    Each part is the latest ``updated_at`` of a table plus its row count, so
+    edits, insertions and deletions all change it.
+    """
+    from .models import Activity, Attendance, Event, Project
+
+    if report_type == "portfolio":
+        return "|".join([
+            _aggregate_stamp(Project.objects.all(), "updated_at"),
+            _aggregate_stamp(Activity.objects.all(), "updated_at"),
+            _aggregate_stamp(Event.objects.all(), "updated_at"),
+            _aggregate_stamp(Attendance.objects.all(), "updated_at"),
+        ])
+
+    parts = [instance.updated_at.isoformat()]
+
+    if report_type == "activity":
+        parts.append(instance.project.updated_at.isoformat())
+    elif report_type == "event":
+        if instance.proyecto_id:
+            parts.append(instance.proyecto.updated_at.isoformat())
+        parts.append(_aggregate_stamp(Attendance.objects.filter(event=instance), "updated_at"))
+    elif report_type == "project":
+        parts.append(_aggregate_stamp(Activity.objects.filter(project=instance), "updated_at"))
+        parts.append(_aggregate_stamp(Event.objects.filter(proyecto=instance), "updated_at"))
+        parts.append(
+            _aggregate_stamp(Attendance.objects.filter(event__proyecto=instance), "updated_at")
+        )
+    return "|".join(parts)
+
+
+def get_cache_key(report_type, generator, file_format="xlsx", sheet=None) -> str:
+    """
+    Return the content address for a report.
+
+    Args:
+        report_type: Report type as registered in ReportGeneratorFactory
+        generator: Report generator holding the instance
+        file_format: Output format of the file
+        sheet: Single exported sheet, for CSV/JSON files
+    """
+    raw = ":".join([
+        report_type,
+        str(getattr(generator.instance, "pk", "")),
+        file_format,
+        sheet or "",
+        f"{generator.__class__.__name__}-v{generator.VERSION}",
+        get_freshness_stamp(report_type, generator.instance),
+    ])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _path_for(key) -> Path:
+    return get_cache_dir() / f"{key}{CACHE_FILE_SUFFIX}"
+
+
+def get(key):
+    """
+    Return the path of a cached file, or None on a miss.
+    A hit refreshes the file's mtime so LRU eviction keeps it.
+    """
+    path = _path_for(key)
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        return None
+    return path
+
+
+def put(key, buffer) -> Path:
+    """
+    Store a generated file and evict old entries if the cache is over its size cap.
+
+    Args:
+        key: Cache key from get_cache_key()
+        buffer: BytesIO with the file contents
+    """
+    path = _path_for(key)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as fh:
+        fh.write(buffer.getbuffer())
+    os.replace(tmp_path, path)
+    evict(keep=path)
+    return path
+
+
+def evict(max_bytes=None, keep=None):
+    """
+    Delete least recently used files until the cache fits within max_bytes.
+
+    Args:
+        max_bytes: Size cap (``settings.REPORT_CACHE_MAX_BYTES`` if None)
+        keep: Path never evicted, e.g. the file just written for the current request
+
+    Returns:
+        int: Number of files removed
+    """
+    if max_bytes is None:
+        max_bytes = settings.REPORT_CACHE_MAX_BYTES
+
+    entries = []
+    total = 0
+    with os.scandir(get_cache_dir()) as it:
+        for entry in it:
+            if not entry.name.endswith(CACHE_FILE_SUFFIX) or entry.path == str(keep):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+    removed = 0
+    entries.sort()
+    for _mtime, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed += 1
+
+    if removed:
+        logger.info("Report cache evicted %s files", removed)
+    return removed
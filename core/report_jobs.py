@@ -0,0 +1,243 @@
+"""
+Background report generation.
+
+``download_report`` builds the workbook inside the request, which ties up a web
+worker for large projects. This module implements a small DB-backed job queue:
+views enqueue a ``ReportJob``, the ``run_report_worker`` management command
+claims and runs jobs in a separate process, and the finished file is stored on
+disk under ``settings.REPORT_JOBS_DIR`` until it expires.
+"""
+import logging
+import os
+import threading
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import ReportJob
+from .reports_generator.factory import ReportGeneratorFactory
+
+logger = logging.getLogger(__name__)
+
+
+class ReportJobLimitExceeded(Exception):
+    """Raised when a user already has too many active report jobs."""
+
+
+def get_jobs_dir() -> Path:
+    """Return the directory where finished report files are stored, creating it if needed."""
+    jobs_dir = Path(settings.REPORT_JOBS_DIR)
+    jobs_dir.mkdir(parents=True, exist_ok=True)
+    return jobs_dir
+
+
+def enqueue_report_job(report_type, instance_id, user=None):
+    """
+    Queue a report for background generation.
+
+    An identical job that is still pending or running for the same user is
+    reused instead of creating a duplicate.
+
+    Raises:
+        ValueError: If report_type is unknown
+        ReportJobLimitExceeded: If the user has too many active jobs
+    """
+    if report_type not in ReportGeneratorFactory.GENERATORS:
+        raise ValueError(f"Unknown report type: {report_type}")
+
+    active_statuses = [ReportJob.StatusChoices.PENDING, ReportJob.StatusChoices.RUNNING]
+    active_jobs = ReportJob.objects.filter(status__in=active_statuses)
+    if user is not None and user.is_authenticated:
+        active_jobs = active_jobs.filter(requested_by=user)
+    else:
+        user = None
+        active_jobs = active_jobs.filter(requested_by__isnull=True)
+
+    existing = active_jobs.filter(report_type=report_type, instance_id=instance_id).first()
+    if existing:
+        return existing
+
+    if active_jobs.count() >= settings.REPORT_JOBS_MAX_ACTIVE_PER_USER:
+        raise ReportJobLimitExceeded(
+            "Ya tienes reportes en cola. Espera a que terminen antes de solicitar otro."
+        )
+
+    return ReportJob.objects.create(
+        report_type=report_type,
+        instance_id=instance_id,
+        requested_by=user,
+    )
+
+
+# Key of the PostgreSQL advisory lock that serializes job claims
+CLAIM_LOCK_ID = 0x5A7A0001
+
+
+def _lock_job_claims():
+    """
+    Make concurrent claims wait for each other until the transaction ends.
+
+    SQLite transactions already take the database write lock when they begin
+    (``transaction_mode = 'IMMEDIATE'`` in settings); PostgreSQL takes an
+    advisory lock instead.
+    """
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [CLAIM_LOCK_ID])
+
+
+def claim_next_job():
+    """
+    Atomically move the oldest pending job to RUNNING and return it.
+
+    Returns None when the queue is empty or when ``REPORT_JOBS_MAX_CONCURRENT``
+    jobs are already running, so extra workers back off instead of competing
+    with interactive traffic for CPU and database time. The running count and
+    the claim happen under one lock, so several workers together never exceed
+    the limit (on SQLite and PostgreSQL).
+    """
+    with transaction.atomic():
+        _lock_job_claims()
+        running = ReportJob.objects.filter(status=ReportJob.StatusChoices.RUNNING).count()
+        if running >= settings.REPORT_JOBS_MAX_CONCURRENT:
+            return None
+
+        pk = (
+            ReportJob.objects.filter(status=ReportJob.StatusChoices.PENDING)
+            .order_by("created_at")
+            .values_list("pk", flat=True)
+            .first()
+        )
+        if pk is None:
+            return None
+        now = timezone.now()
+        ReportJob.objects.filter(pk=pk).update(
+            status=ReportJob.StatusChoices.RUNNING, started_at=now, heartbeat_at=now
+        )
+    return ReportJob.objects.get(pk=pk)
+
+
+class _Heartbeat(threading.Thread):
+    """
+    Refresh a running job's ``heartbeat_at`` every
+    ``REPORT_JOBS_HEARTBEAT_INTERVAL`` seconds until stopped, so
+    ``requeue_stale_jobs()`` can tell a long report from a dead worker.
+    """
+
+    def __init__(self, job_pk):
+        super().__init__(name=f"report-job-{job_pk}-heartbeat", daemon=True)
+        self.job_pk = job_pk
+        self.stopped = threading.Event()
+
+    def run(self):
+        try:
+            while not self.stopped.wait(settings.REPORT_JOBS_HEARTBEAT_INTERVAL):
+                try:
+                    ReportJob.objects.filter(
+                        pk=self.job_pk, status=ReportJob.StatusChoices.RUNNING
+                    ).update(heartbeat_at=timezone.now())
+                except DatabaseError:
+                    # e.g. "database is locked"; the next beat retries
+                    logger.warning("Heartbeat of report job %s failed", self.job_pk, exc_info=True)
+        finally:
+            # The thread has its own database connection
+            connection.close()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def run_report_job(job):
+    """
+    Generate the report for a claimed job and store the file on disk.
+
+    Failures are recorded on the job instead of being raised, so a single bad
+    report never stops the worker loop.
+    """
+    heartbeat = _Heartbeat(job.pk)
+    heartbeat.start()
+    try:
+        return _run_report_job(job)
+    finally:
+        heartbeat.stop()
+
+
+def _run_report_job(job):
+    try:
+        generator = ReportGeneratorFactory.create(job.report_type, job.instance_id)
+        is_valid, error_msg = generator.validate_instance()
+        if not is_valid:
+            raise ValueError(error_msg)
+
+        excel_file = generator.generate_excel()
+        filename = generator.get_filename()
+
+        target = get_jobs_dir() / f"{job.pk}_{filename}"
+        tmp_target = target.with_name(target.name + ".tmp")
+        with open(tmp_target, "wb") as fh:
+            fh.write(excel_file.getbuffer())
+        os.replace(tmp_target, target)
+    except Exception as e:
+        logger.exception("Report job %s failed", job.pk)
+        job.status = ReportJob.StatusChoices.FAILED
+        job.error = str(e)
+        job.finished_at = timezone.now()
+        job.save(update_fields=["status", "error", "finished_at"])
+        return job
+
+    job.status = ReportJob.StatusChoices.DONE
+    job.filename = filename
+    job.file_path = str(target)
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "filename", "file_path", "finished_at"])
+    logger.info("Report job %s finished: %s", job.pk, filename)
+    return job
+
+
+def requeue_stale_jobs():
+    """
+    Return RUNNING jobs whose worker died mid-generation to the queue.
+
+    A live worker refreshes its job's ``heartbeat_at`` every
+    ``REPORT_JOBS_HEARTBEAT_INTERVAL`` seconds, so only jobs without a
+    heartbeat for ``REPORT_JOBS_STALE_AFTER`` seconds are requeued, however
+    long the report takes.
+
+    Returns:
+        int: Number of jobs requeued
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.REPORT_JOBS_STALE_AFTER)
+    return ReportJob.objects.filter(
+        Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, started_at__lt=cutoff),
+        status=ReportJob.StatusChoices.RUNNING,
+    ).update(status=ReportJob.StatusChoices.PENDING, started_at=None, heartbeat_at=None)
+
+
+def purge_expired_jobs():
+    """
+    Delete finished jobs (and their files) older than ``REPORT_JOBS_RETENTION``.
+
+    Returns:
+        int: Number of jobs deleted
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.REPORT_JOBS_RETENTION)
+    expired = ReportJob.objects.filter(
+        status__in=[ReportJob.StatusChoices.DONE, ReportJob.StatusChoices.FAILED],
+        finished_at__lt=cutoff,
+    )
+    count = 0
+    with transaction.atomic():
+        for job in expired:
+            if job.file_path:
+                try:
+                    os.remove(job.file_path)
+                except FileNotFoundError:
+                    pass
+            job.delete()
+            count += 1
+    return count
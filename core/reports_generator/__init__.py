@@ -1,18 +1,32 @@
 """
 reports/generators/__init__.py
 Convenient imports for all report generators
-"""
 
-from .base import BaseReportGenerator
-from .activity import ActivityReportGenerator
-from .project import ProjectReportGenerator
+Generators are loaded lazily (PEP 562) so that importing this package, e.g.
+from core.views, does not pull pandas into every web worker. The heavy
+dependencies are only imported when a report is actually generated.
+"""
+from importlib import import_module
 
-# Import these when you create them
-# from .event import EventReportGenerator
+_LAZY_ATTRIBUTES = {
+    'BaseReportGenerator': '.base',
+    'ActivityReportGenerator': '.activity',
+    'EventReportGenerator': '.event',
+    'ProjectReportGenerator': '.project',
+    'PortfolioReportGenerator': '.portfolio',
+}
 
 __all__ = [
     'BaseReportGenerator',
     'ActivityReportGenerator',
     'ProjectReportGenerator',
-    # 'EventReportGenerator',
-]
\ No newline at end of file
+    'EventReportGenerator',
+    'PortfolioReportGenerator',
+]
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        module = import_module(_LAZY_ATTRIBUTES[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
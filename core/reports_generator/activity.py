@@ -2,7 +2,6 @@
 reports/generators/activity.py
 Activity-specific report generator
 """
-import pandas as pd
 from .base import BaseReportGenerator
 
 
@@ -18,12 +17,12 @@ class ActivityReportGenerator(BaseReportGenerator):
     
     def prepare_data(self):
         """
-        Convert Activity instance to DataFrame using automatic extraction.
+        Convert Activity instance to a Table using automatic extraction.
         """
         # Use the base class method to extract all model data automatically
         data = self.extract_model_data()
         
-        self.df = pd.DataFrame([data])
+        self.table = self.to_table([data])
     
     def validate_instance(self):
         """
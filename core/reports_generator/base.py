@@ -3,22 +3,36 @@ reports/generators/base.py
 Abstract base class for all report generators
 """
 from abc import ABC, abstractmethod
-import pandas as pd
 from io import BytesIO
-from typing import BinaryIO, Dict, Any
+from typing import TYPE_CHECKING, BinaryIO, Dict, Any, Iterable, Optional, Sequence
+from django.conf import settings
 from django.db import models
 from datetime import datetime, date
 
+from .profiling import GenerationProfile
+from .tabular import Column, Table, get_writer
+
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 class BaseReportGenerator(ABC):
     """
     Abstract base class for all report generators.
-    Provides common functionality for generating Excel reports from Django models.
+    Provides common functionality for generating Excel, CSV and JSON reports
+    from Django models.
     """
     
     # Fields to exclude from automatic extraction
     EXCLUDED_FIELDS = ['id']
     
+    # Bump when the generated output changes, so cached report files are rebuilt
+    VERSION = 4
+    
+    # Named cell styles registered by apply_formatting()
+    HEADER_STYLE = 'Reporte encabezado'
+    DATA_STYLE = 'Reporte datos'
+    
     def __init__(self, instance, include_custom_sheets=True):
         """
         Initialize the generator with a model instance
@@ -28,21 +42,25 @@ class BaseReportGenerator(ABC):
             include_custom_sheets: Whether to include custom sheets (default: True)
         """
         self.instance = instance
-        self.df = None
+        self.table = None
         self.include_custom_sheets = include_custom_sheets
+        self.profile = GenerationProfile()
     
-    def get_field_value(self, field) -> Any:
+    def get_field_value(self, field, instance=None) -> Any:
         """
         Extract value from a model field, handling different field types.
         
         Args:
             field: Django model field
+            instance: Model instance to read from (default: self.instance)
             
         Returns:
             Formatted value appropriate for Excel
         """
+        if instance is None:
+            instance = self.instance
         field_name = field.name
-        value = getattr(self.instance, field_name)
+        value = getattr(instance, field_name)
         
         # Handle None/empty values
         if value is None or value == '':
@@ -54,7 +72,7 @@ class BaseReportGenerator(ABC):
         
         # Handle choice fields
         if field.choices:
-            return self.get_choice_display(field_name)
+            return self.get_choice_display(field_name, instance)
         
         # Handle date/datetime fields
         if isinstance(field, (models.DateField, models.DateTimeField)):
@@ -97,20 +115,23 @@ class BaseReportGenerator(ABC):
         # Fallback to __str__
         return str(related_instance)
     
-    def get_choice_display(self, field_name: str) -> str:
+    def get_choice_display(self, field_name: str, instance=None) -> str:
         """
         Get display value for a field with choices.
         
         Args:
             field_name: Name of the field with choices
+            instance: Model instance to read from (default: self.instance)
             
         Returns:
             Human-readable choice value
         """
+        if instance is None:
+            instance = self.instance
         get_display_method = f'get_{field_name}_display'
-        if hasattr(self.instance, get_display_method):
-            return getattr(self.instance, get_display_method)()
-        return getattr(self.instance, field_name, '')
+        if hasattr(instance, get_display_method):
+            return getattr(instance, get_display_method)()
+        return getattr(instance, field_name, '')
     
     def format_date(self, date_value, include_time: bool = False) -> str:
         """
@@ -145,18 +166,24 @@ class BaseReportGenerator(ABC):
         """
         return field.verbose_name if hasattr(field, 'verbose_name') else field.name.replace('_', ' ').title()
     
-    def extract_model_data(self) -> Dict[str, Any]:
+    def extract_model_data(self, instance=None) -> Dict[str, Any]:
         """
         Automatically extract all fields from the model instance.
         Creates a dictionary with verbose_name as key and formatted value.
         
+        Args:
+            instance: Model instance to extract (default: self.instance).
+                Lets one generator extract many related rows.
+        
         Returns:
             Dictionary of field labels and values
         """
+        if instance is None:
+            instance = self.instance
         data = {}
         
         # Get all fields from the model
-        fields = self.instance._meta.get_fields()
+        fields = instance._meta.get_fields()
         
         for field in fields:
             # Skip excluded fields and reverse relations
@@ -169,7 +196,7 @@ class BaseReportGenerator(ABC):
             
             # Get label and value
             label = self.get_field_label(field)
-            value = self.get_field_value(field)
+            value = self.get_field_value(field, instance)
             
             data[label] = value
         
@@ -216,23 +243,40 @@ class BaseReportGenerator(ABC):
                     return value
         return datetime.now()
     
+    def to_table(self, records: Iterable[Dict[str, Any]], columns: Optional[Sequence[Column]] = None) -> Table:
+        """
+        Build a Table from row dictionaries.
+        
+        Args:
+            records: Rows as dictionaries of column label -> value. May be a
+                generator when columns are given.
+            columns: Column specs (default: union of the record keys)
+            
+        Returns:
+            Table: Rows are consumed when the sheet is written
+        """
+        return Table.from_records(records, columns=columns)
+    
     @abstractmethod
     def prepare_data(self):
         """
-        Convert model instance to pandas DataFrame.
-        Must set self.df with the prepared data.
+        Convert model instance to a Table.
+        Must set self.table with the prepared data.
         
         Should be implemented by subclasses to handle model-specific logic.
         """
         pass
     
-    def get_filename(self) -> str:
+    def get_filename(self, file_format: str = 'xlsx') -> str:
         """
         Generate appropriate filename for the report, with a sensible default:
-        {Prefix}_{SanitizedName}_{YYYYMMDD}.xlsx
+        {Prefix}_{SanitizedName}_{YYYYMMDD}.{file_format}
+        
+        Args:
+            file_format: Output format used as the extension (default: 'xlsx')
         
         Returns:
-            str: Filename with .xlsx extension
+            str: Filename with the format's extension
         """
         # Build prefix
         prefix = self._get_report_prefix()
@@ -249,21 +293,21 @@ class BaseReportGenerator(ABC):
         date_value = self._get_primary_date_for_filename()
         date_str = self.format_date(date_value).replace('-', '')
         
-        return f"{prefix}_{safe_name}_{date_str}.xlsx"
+        return f"{prefix}_{safe_name}_{date_str}.{file_format}"
     
     def add_custom_sheets(self, writer):
         """
-        Hook for subclasses to add additional sheets to the Excel workbook.
+        Hook for subclasses to add additional sheets to the report.
         Called after the main 'Datos' sheet is created and formatted.
         
         Args:
-            writer: pandas ExcelWriter object
+            writer: Report writer from tabular.get_writer()
             
         Example:
             def add_custom_sheets(self, writer):
                 # Add a sheet with related data
-                related_df = pd.DataFrame(self._get_related_data())
-                related_df.to_excel(writer, index=False, sheet_name='Related Items')
+                related_table = self.to_table(self._get_related_data())
+                self.write_sheet(writer, related_table, 'Related Items')
         """
         # Default implementation - does nothing
         # Subclasses can override to add custom sheets
@@ -274,61 +318,66 @@ class BaseReportGenerator(ABC):
         Apply Excel formatting to a specific sheet in the workbook.
         Provides a clean, professional default formatting.
         Can be overridden by subclasses for custom formatting.
+        Only XLSX writers have sheets to format; other formats are skipped.
         
         Args:
-            writer: pandas ExcelWriter object
+            writer: Report writer from tabular.get_writer()
             sheet_name: Name of the sheet to format (default: 'Datos')
         """
-        from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-        from openpyxl.utils import get_column_letter
-        
-        workbook = writer.book
-        
         # Check if sheet exists
         if sheet_name not in writer.sheets:
             return
-            
-        worksheet = writer.sheets[sheet_name]
         
-        # Define default color scheme
-        header_fill = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
-        header_font = Font(bold=True, color='FFFFFF', size=11)
-        data_fill = PatternFill(start_color='F2F2F2', end_color='F2F2F2', fill_type='solid')
+        from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
+        from openpyxl.utils import get_column_letter
         
-        border = Border(
-            left=Side(style='thin', color='000000'),
-            right=Side(style='thin', color='000000'),
-            top=Side(style='thin', color='000000'),
-            bottom=Side(style='thin', color='000000')
-        )
+        workbook = writer.book
+        worksheet = writer.sheets[sheet_name]
+        headers, sample = writer.samples[sheet_name]
+        
+        # Register the default styles once per workbook. Assigning a named
+        # style only copies its style ids, instead of hashing a new fill,
+        # border and alignment for every cell.
+        if self.HEADER_STYLE not in workbook.named_styles:
+            border = Border(
+                left=Side(style='thin', color='000000'),
+                right=Side(style='thin', color='000000'),
+                top=Side(style='thin', color='000000'),
+                bottom=Side(style='thin', color='000000')
+            )
+            workbook.add_named_style(NamedStyle(
+                name=self.HEADER_STYLE,
+                fill=PatternFill(start_color='366092', end_color='366092', fill_type='solid'),
+                font=Font(bold=True, color='FFFFFF', size=11),
+                alignment=Alignment(horizontal='center', vertical='center', wrap_text=True),
+                border=border,
+            ))
+            workbook.add_named_style(NamedStyle(
+                name=self.DATA_STYLE,
+                fill=PatternFill(start_color='F2F2F2', end_color='F2F2F2', fill_type='solid'),
+                alignment=Alignment(vertical='top', wrap_text=True),
+                border=border,
+            ))
         
         # Format header row
-        for col_num, column in enumerate(self.df.columns, 1):
-            cell = worksheet.cell(row=1, column=col_num)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-            cell.border = border
+        for cell in worksheet[1][:len(headers)]:
+            cell.style = self.HEADER_STYLE
         
         # Format data rows
-        for row_num in range(2, worksheet.max_row + 1):
-            for col_num in range(1, len(self.df.columns) + 1):
-                cell = worksheet.cell(row=row_num, column=col_num)
-                cell.border = border
-                cell.alignment = Alignment(vertical='top', wrap_text=True)
-                cell.fill = data_fill
+        for row in worksheet.iter_rows(min_row=2, max_col=len(headers)):
+            for cell in row:
+                cell.style = self.DATA_STYLE
         
         # Adjust column widths based on content
-        for col_num, column in enumerate(self.df.columns, 1):
+        for col_num, column in enumerate(headers, 1):
             column_letter = get_column_letter(col_num)
             
             # Calculate width based on column name and content
             max_length = len(str(column))  # Start with header length
             
-            # Check data length (sample first few rows for performance)
-            for row_num in range(min(5, len(self.df))):
-                cell_value = str(self.df.iloc[row_num, col_num - 1])
-                max_length = max(max_length, len(cell_value))
+            # Check data length (the writer samples the first few rows)
+            for row in sample:
+                max_length = max(max_length, len(str(row[col_num - 1])))
             
             # Set width with reasonable bounds (min 15, max 50)
             adjusted_width = min(max(max_length + 2, 15), 50)
@@ -339,78 +388,113 @@ class BaseReportGenerator(ABC):
         for row_num in range(2, worksheet.max_row + 1):
             worksheet.row_dimensions[row_num].height = 30  # Data rows
     
-    def generate_excel(self) -> BinaryIO:
+    def write_sheet(self, writer, table: Table, sheet_name: str):
         """
-        Generate Excel file and return as BytesIO object.
-        This is the main method to call from views.
+        Write a Table to a sheet and apply the default formatting to it.
+        Writing and formatting are timed separately in self.profile.
+        
+        Args:
+            writer: Report writer from tabular.get_writer()
+            table: Table with the sheet rows
+            sheet_name: Name of the sheet to create
+        """
+        with self.profile.span(f'write:{sheet_name}'):
+            writer.write(table, sheet_name)
+        
+        with self.profile.span(f'formatting:{sheet_name}'):
+            self.apply_formatting(writer, sheet_name=sheet_name)
+    
+    def _get_profile_label(self) -> str:
+        return f"{self.__class__.__name__} #{getattr(self.instance, 'pk', '')}"
+    
+    def _build_report(self, target, file_format: str = 'xlsx', sheet: Optional[str] = None):
+        """
+        Prepare the data and write the full report to target (path or buffer),
+        recording timing spans, query counts and memory in self.profile.
+        """
+        self.profile = GenerationProfile(
+            trace_memory=getattr(settings, 'REPORTS_PROFILE_MEMORY', False)
+        )
+        with self.profile.track(self._get_profile_label()):
+            writer = get_writer(file_format, target, sheet=sheet)
+            
+            # Prepare the data
+            with self.profile.span('prepare_data'):
+                self.prepare_data()
+            
+            # Validate that the table was created
+            if self.table is None:
+                raise ValueError("prepare_data() must set self.table")
+            
+            # Write and format the main data sheet
+            self.write_sheet(writer, self.table, 'Datos')
+            
+            # Allow subclasses to add custom sheets (only if enabled)
+            if self.include_custom_sheets:
+                with self.profile.span('custom_sheets'):
+                    self.add_custom_sheets(writer)
+            
+            # Saving the workbook zips and writes the XML parts
+            with self.profile.span('serialization'):
+                writer.close()
+    
+    def generate(self, file_format: str = 'xlsx', sheet: Optional[str] = None) -> BinaryIO:
+        """
+        Generate the report in the given format and return it as a BytesIO object.
         
+        Args:
+            file_format: 'xlsx', 'csv' or 'json' (see tabular.FILE_FORMATS)
+            sheet: For CSV/JSON, export only this sheet (CSV defaults to 'Datos')
+            
         Returns:
-            BytesIO: Excel file in memory
+            BytesIO: Report file in memory
             
         Raises:
-            ValueError: If prepare_data() hasn't set self.df
+            ValueError: If the format or sheet is unknown, or prepare_data()
+                hasn't set self.table
         """
-        # Prepare the data
-        self.prepare_data()
-        
-        # Validate that DataFrame was created
-        if self.df is None:
-            raise ValueError("prepare_data() must set self.df")
-        
         # Create BytesIO buffer
         buffer = BytesIO()
         
-        # Write to Excel
-        with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-            # Write main data sheet
-            self.df.to_excel(writer, index=False, sheet_name='Datos')
-            
-            # Apply formatting to main sheet
-            self.apply_formatting(writer, sheet_name='Datos')
-            
-            # Allow subclasses to add custom sheets (only if enabled)
-            if self.include_custom_sheets:
-                self.add_custom_sheets(writer)
+        self._build_report(buffer, file_format=file_format, sheet=sheet)
         
         # Reset buffer position to beginning
         buffer.seek(0)
         
         return buffer
     
-    def generate_and_save(self, filepath: str):
+    def generate_excel(self) -> BinaryIO:
+        """
+        Generate Excel file and return as BytesIO object.
+        
+        Returns:
+            BytesIO: Excel file in memory
+        """
+        return self.generate('xlsx')
+    
+    def generate_and_save(self, filepath: str, file_format: str = 'xlsx'):
         """
-        Generate Excel file and save to disk.
+        Generate the report and save it to disk.
         Useful for testing or batch generation.
         
         Args:
             filepath: Full path where to save the file
+            file_format: Output format (default: 'xlsx')
         """
-        self.prepare_data()
-        
-        if self.df is None:
-            raise ValueError("prepare_data() must set self.df")
-        
-        with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-            # Write main data sheet
-            self.df.to_excel(writer, index=False, sheet_name='Datos')
-            
-            # Apply formatting to main sheet
-            self.apply_formatting(writer, sheet_name='Datos')
-            
-            # Allow subclasses to add custom sheets (only if enabled)
-            if self.include_custom_sheets:
-                self.add_custom_sheets(writer)
+        self._build_report(filepath, file_format=file_format)
     
-    def get_dataframe(self) -> pd.DataFrame:
+    def get_dataframe(self) -> 'pd.DataFrame':
         """
-        Get the prepared DataFrame without generating Excel.
-        Useful for testing or further processing.
+        Get the prepared main sheet as a pandas DataFrame without generating a file.
+        Useful for testing or further processing; pandas is imported on demand.
         
         Returns:
             pd.DataFrame: Prepared data
         """
+        import pandas as pd
+        
         self.prepare_data()
-        return self.df
+        return pd.DataFrame(self.table.to_records(), columns=self.table.headers)
     
     def validate_instance(self):
         """
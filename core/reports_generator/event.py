@@ -2,8 +2,12 @@
 reports/generators/event.py
 Event-specific report generator
 """
-import pandas as pd
+from django.db.models import prefetch_related_objects
 from .base import BaseReportGenerator
+from .tabular import Column
+
+# Primary key, event foreign key and the internal deduplication/identity fields
+ATTENDANCE_EXCLUDED_FIELDS = ('id', 'event', 'submission_key', 'participant_key', 'participant')
 
 
 class EventReportGenerator(BaseReportGenerator):
@@ -13,69 +17,109 @@ class EventReportGenerator(BaseReportGenerator):
     """
 
     # Optional: Exclude specific fields from the report
-    EXCLUDED_FIELDS = ['id']  # Inherit from base and add more if needed
+    # (the stored attendance stats are shown as the metric columns instead)
+    EXCLUDED_FIELDS = ['id', 'attendance_count', 'department_count', 'average_satisfaction']
 
     def prepare_data(self):
         """
-        Convert Event instance to DataFrame using automatic extraction.
+        Convert Event instance to a Table using automatic extraction.
         Adds custom columns for event-specific metrics.
         """
         # Use the base class method to extract all model data automatically
         data = self.extract_model_data()
 
-        # Add custom columns for event metrics
-        data['Total de Participantes'] = self._get_total_participants()
-        data['Diversidad Geográfica'] = self._get_geographic_diversity()
-        # section Acceptability, average satisfaction score
-        data['Aceptabilidad Promedio (Sección 3)'] = self._get_average_satisfaction()
+        # Add custom columns for event metrics (participants, departments,
+        # section 3 acceptability average)
+        data.update(self.get_event_metrics(self.instance))
+
+        self.table = self.to_table([data])
 
-        self.df = pd.DataFrame([data])
+    def _get_attendances(self):
+        """
+        Return this event's attendances, loaded with a single query per generator.
+        Reuses attendances already prefetched by a caller (e.g. the project report).
+        """
+        prefetch_related_objects([self.instance], 'attendances')
+        return self.instance.attendances.all()
+
+    @staticmethod
+    def get_event_metrics(event):
+        """
+        Return the event summary metrics from the attendance stats stored on
+        the event (see core.event_stats), without reading attendance rows.
+
+        Args:
+            event: Event instance
+
+        Returns:
+            Dictionary with participant count, geographic diversity and
+            average acceptability
+        """
+        return {
+            'Total de Participantes': event.attendance_count,
+            'Diversidad Geográfica': event.department_count,
+            'Aceptabilidad Promedio (Sección 3)': event.average_satisfaction,
+        }
 
     def add_custom_sheets(self, writer):
         """
         Add sheets with all attendance records for this event.
 
         Args:
-            writer: pandas ExcelWriter object
+            writer: Report writer from tabular.get_writer()
         """
-        self._add_attendance_sheet(writer)
+        with self.profile.span('sheet:Asistencias'):
+            self._add_attendance_sheet(writer)
 
     def _add_attendance_sheet(self, writer):
         """
         Add a sheet with all attendance records for this event.
         First column contains the event name, followed by all attendance fields.
+        Rows are extracted while the sheet is written.
 
         Args:
-            writer: pandas ExcelWriter object
+            writer: Report writer from tabular.get_writer()
         """
-        attendances = self.instance.attendances.all()
+        attendances = self._get_attendances()
 
-        if attendances.exists():
-            # Prepare attendance data
-            attendance_data = []
+        if attendances:
+            attendance_table = self.to_table(
+                self.iter_attendance_rows([self.instance]),
+                columns=self.get_attendance_columns(),
+            )
 
-            for attendance in attendances:
-                # Extract attendance fields
-                row = {
-                    'Evento': self.instance.name,
-                }
+            # Write to a new sheet and apply formatting
+            self.write_sheet(writer, attendance_table, 'Asistencias')
 
-                # Add all attendance fields using base extraction method
-                attendance_dict = self._extract_attendance_fields(attendance)
-                row.update(attendance_dict)
+    def get_attendance_columns(self):
+        """
+        Columns of the attendance sheet: the event name followed by every
+        Attendance field except those in ATTENDANCE_EXCLUDED_FIELDS.
 
-                attendance_data.append(row)
+        Returns:
+            list: Column specs
+        """
+        from core.models import Attendance
 
-            attendance_df = pd.DataFrame(attendance_data)
+        columns = [Column('Evento')]
+        for field in Attendance._meta.get_fields():
+            if field.name in ATTENDANCE_EXCLUDED_FIELDS or field.one_to_many or field.many_to_many:
+                continue
+            columns.append(Column(self.get_field_label(field)))
+        return columns
 
-            # Write to a new sheet
-            attendance_df.to_excel(writer, index=False, sheet_name='Asistencias')
+    def iter_attendance_rows(self, events):
+        """
+        Yield one attendance sheet record per attendance of the given events.
 
-            # Apply formatting to the attendance sheet
-            original_df = self.df
-            self.df = attendance_df
-            self.apply_formatting(writer, sheet_name='Asistencias')
-            self.df = original_df
+        Args:
+            events: Event instances with loaded or prefetched attendances
+        """
+        for event in events:
+            for attendance in event.attendances.all():
+                row = {'Evento': event.name}
+                row.update(self._extract_attendance_fields(attendance))
+                yield row
 
     def _extract_attendance_fields(self, attendance):
         """
@@ -97,7 +141,7 @@ class EventReportGenerator(BaseReportGenerator):
 
         for field in fields:
             # Skip excluded fields and reverse relations
-            if field.name in ['id', 'event']:  # Skip primary key and foreign key to Event
+            if field.name in ATTENDANCE_EXCLUDED_FIELDS:
                 continue
 
             # Skip reverse relations
@@ -136,7 +180,7 @@ class EventReportGenerator(BaseReportGenerator):
         Returns:
             int: Total number of attendance records
         """
-        return self.instance.attendances.count()
+        return self.instance.attendance_count
     
     def _get_geographic_diversity(self):
         """
@@ -146,15 +190,7 @@ class EventReportGenerator(BaseReportGenerator):
         Returns:
             int: Number of unique departments
         """
-        attendances = self.instance.attendances.all()
-        
-        # Get unique, non-empty departments
-        departments = set()
-        for attendance in attendances:
-            if attendance.department and attendance.department.strip():
-                departments.add(attendance.department)
-        
-        return len(departments)
+        return self.instance.department_count
     
     def _get_average_satisfaction(self):
         """
@@ -163,22 +199,7 @@ class EventReportGenerator(BaseReportGenerator):
         Returns:
             float: Average satisfaction rating (rounded to 2 decimals), or 0 if no data
         """
-        attendances = self.instance.attendances.all()
-        
-        if not attendances.exists():
-            return 0
-        
-        # Sum per-record mean of the five acceptability items (1–5 each)
-        total_satisfaction = sum(
-            attendance.average_satisfaction_score for attendance in attendances
-        )
-        count = attendances.count()
-        
-        if count == 0:
-            return 0
-        
-        average = total_satisfaction / count
-        return round(average, 2)
+        return self.instance.average_satisfaction
 
     def validate_instance(self):
         """
@@ -3,9 +3,7 @@ reports/factory.py
 Factory for creating the appropriate report generator based on type
 """
 from django.core.exceptions import ObjectDoesNotExist
-from .activity import ActivityReportGenerator
-from .project import ProjectReportGenerator
-from .event import EventReportGenerator
+from django.utils.module_loading import import_string
 
 
 class ReportGeneratorFactory:
@@ -14,22 +12,34 @@ class ReportGeneratorFactory:
     based on the report type and instance ID.
     """
     
-    # Registry mapping report types to (Model, Generator)
+    # Registry mapping report types to (Model, Generator).
+    # Generators are imported on first use so that importing the factory
+    # (e.g. from core.views) does not load pandas in every web worker.
     GENERATORS = {
         'activity': {
             'model': None,  # Will be set dynamically to avoid circular imports
-            'generator': ActivityReportGenerator,
+            'generator': None,  # Will be imported on first use
             'model_path': 'core.models.Activity',  # Update with your app name
+            'generator_path': 'core.reports_generator.activity.ActivityReportGenerator',
         },
         'project': {
             'model': None,
-            'generator': ProjectReportGenerator,
+            'generator': None,
             'model_path': 'core.models.Project',
+            'generator_path': 'core.reports_generator.project.ProjectReportGenerator',
         },
         'event': {
             'model': None,
-            'generator': EventReportGenerator,
+            'generator': None,
             'model_path': 'core.models.Event',
+            'generator_path': 'core.reports_generator.event.EventReportGenerator',
+        },
+        # Covers every project, so it has no model instance
+        'portfolio': {
+            'model': None,
+            'generator': None,
+            'model_path': None,
+            'generator_path': 'core.reports_generator.portfolio.PortfolioReportGenerator',
         },
     }
     
@@ -42,7 +52,7 @@ class ReportGeneratorFactory:
             report_type: Type of report ('activity', 'event', 'project')
             
         Returns:
-            Model class
+            Model class, or None for report types without an instance
         """
         if report_type not in cls.GENERATORS:
             raise ValueError(f"Unknown report type: {report_type}")
@@ -50,7 +60,7 @@ class ReportGeneratorFactory:
         config = cls.GENERATORS[report_type]
         
         # Lazy load the model if not already loaded
-        if config['model'] is None:
+        if config['model'] is None and config['model_path'] is not None:
             from django.apps import apps
             model_path = config['model_path']
             # model_path is like 'core.models.Activity'
@@ -61,6 +71,27 @@ class ReportGeneratorFactory:
         
         return config['model']
     
+    @classmethod
+    def _get_generator_class(cls, report_type):
+        """
+        Lazy load the generator class so heavy report dependencies are only
+        imported when a report is generated.
+        
+        Args:
+            report_type: Type of report ('activity', 'event', 'project')
+            
+        Returns:
+            BaseReportGenerator subclass
+        """
+        if report_type not in cls.GENERATORS:
+            raise ValueError(f"Unknown report type: {report_type}")
+        
+        config = cls.GENERATORS[report_type]
+        if config['generator'] is None:
+            config['generator'] = import_string(config['generator_path'])
+        
+        return config['generator']
+    
     @classmethod
     def create(cls, report_type, instance_id, include_custom_sheets=True):
         """
@@ -69,6 +100,7 @@ class ReportGeneratorFactory:
         Args:
             report_type: Type of report ('activity', 'event', 'project')
             instance_id: ID of the instance to generate report for
+                (ignored by report types without a model, e.g. 'portfolio')
             include_custom_sheets: Whether to include custom sheets (default: True)
             
         Returns:
@@ -86,7 +118,10 @@ class ReportGeneratorFactory:
         
         # Get the model and generator classes
         model_class = cls._get_model_class(report_type)
-        generator_class = cls.GENERATORS[report_type]['generator']
+        generator_class = cls._get_generator_class(report_type)
+        
+        if model_class is None:
+            return generator_class(None, include_custom_sheets=include_custom_sheets)
         
         # Fetch the instance
         try:
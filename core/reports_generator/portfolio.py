@@ -0,0 +1,231 @@
+"""
+reports/generators/portfolio.py
+Cross-project portfolio report generator
+"""
+from datetime import datetime
+
+from core.event_stats import SATISFACTION_FIELDS
+from core.models import Activity
+
+from .base import BaseReportGenerator
+from .tabular import Column, Table
+
+# pandas selects several columns with a list (a tuple would be a single key)
+ACTIVITY_METRICS = list(Activity.METRIC_FIELDS)
+SATISFACTION_COLUMNS = list(SATISFACTION_FIELDS)
+
+# Column labels shared by the portfolio, program and project sheets
+PROJECTS = 'Proyectos'
+ACTIVITIES = 'Actividades'
+EVENTS = 'Eventos'
+PARTICIPANTS = 'Participantes en Eventos'
+DEPARTMENTS = 'Diversidad Geográfica'
+ACCEPTABILITY = 'Aceptabilidad Promedio (Sección 3)'
+RETENTION = 'Tasa de Retención (2+ eventos) %'
+
+
+def _frame_to_table(frame) -> Table:
+    """Wrap a DataFrame's rows in a Table without copying them into dictionaries."""
+    return Table(
+        [Column(str(column)) for column in frame.columns],
+        frame.itertuples(index=False, name=None),
+    )
+
+
+class PortfolioReportGenerator(BaseReportGenerator):
+    """
+    Generates one workbook covering every project: activity metric totals by
+    program and area, event counts, attendance, acceptability, department
+    coverage and retention.
+
+    Each model is read with a single values_list() query and the aggregates are
+    computed with pandas groupby, so the cost grows with the number of rows and
+    not with the number of projects (no per-project generator runs).
+    """
+
+    def __init__(self, instance=None, include_custom_sheets=True):
+        super().__init__(instance, include_custom_sheets=include_custom_sheets)
+        self._frames = None
+
+    def _load_frames(self):
+        """
+        Load projects, activities, events and attendances as DataFrames
+        (four queries). Events without a project are not part of the portfolio.
+        """
+        if self._frames is not None:
+            return self._frames
+
+        import pandas as pd
+        from core.models import Attendance, Event, Project
+
+        def frame(queryset, columns):
+            return pd.DataFrame.from_records(list(queryset.values_list(*columns)), columns=columns)
+
+        projects = frame(Project.objects.all(), ['id', 'name', 'program', 'status'])
+        projects = projects.rename(columns={'id': 'project_id'})
+        program_of = projects.set_index('project_id')['program']
+
+        activities = frame(Activity.objects.all(), ['project_id', 'area', *ACTIVITY_METRICS])
+        activities['program'] = activities['project_id'].map(program_of)
+
+        events = frame(Event.objects.filter(proyecto__isnull=False), ['id', 'proyecto_id'])
+        events = events.rename(columns={'id': 'event_id', 'proyecto_id': 'project_id'})
+        events['program'] = events['project_id'].map(program_of)
+
+        attendances = frame(
+            Attendance.objects.filter(event__proyecto__isnull=False),
+            ['event_id', 'event__proyecto_id', 'department', 'participant_id', *SATISFACTION_COLUMNS],
+        )
+        attendances = attendances.rename(columns={'event__proyecto_id': 'project_id'})
+        attendances['program'] = attendances['project_id'].map(program_of)
+        # Same definitions as Attendance.average_satisfaction_score and the
+        # project report: blank departments and unlinked attendances don't count
+        attendances['score'] = attendances[SATISFACTION_COLUMNS].mean(axis=1)
+        department = attendances['department'].fillna('').str.strip()
+        attendances['department'] = department.mask(department == '')
+
+        for df in (projects, activities, events, attendances):
+            df['portfolio'] = 'Portafolio'
+
+        self._frames = {
+            'projects': projects,
+            'activities': activities,
+            'events': events,
+            'attendances': attendances,
+        }
+        return self._frames
+
+    def summarize(self, key):
+        """
+        Aggregate every metric by a grouping column.
+
+        Args:
+            key: 'portfolio' (one row), 'program' or 'project_id'
+
+        Returns:
+            pd.DataFrame: One row per group, indexed by the key
+        """
+        frames = self._load_frames()
+        projects = frames['projects']
+        activities = frames['activities']
+        attendances = frames['attendances']
+
+        metric_labels = self.get_activity_metric_labels()
+        index = projects[key].drop_duplicates()
+
+        summary = projects.groupby(key).size().to_frame(PROJECTS)
+        summary[ACTIVITIES] = activities.groupby(key).size()
+        summary = summary.join(
+            activities.groupby(key)[ACTIVITY_METRICS].sum().rename(columns=metric_labels)
+        )
+        summary[EVENTS] = frames['events'].groupby(key).size()
+
+        by_group = attendances.groupby(key)
+        summary[PARTICIPANTS] = by_group.size()
+        summary[DEPARTMENTS] = by_group['department'].nunique()
+        summary[ACCEPTABILITY] = by_group['score'].mean().round(2)
+
+        # Share of identified participants who attended 2+ events of the group
+        events_per_person = (
+            attendances.dropna(subset=['participant_id'])
+            .groupby([key, 'participant_id'])['event_id']
+            .nunique()
+        )
+        retention = (events_per_person >= 2).groupby(level=0).mean() * 100
+        summary[RETENTION] = retention.round(2)
+
+        summary = summary.reindex(index).fillna(0)
+        count_columns = [PROJECTS, ACTIVITIES, EVENTS, PARTICIPANTS, DEPARTMENTS, *metric_labels.values()]
+        summary[count_columns] = summary[count_columns].astype('int64')
+        return summary
+
+    def get_activity_metric_labels(self):
+        """Return {field name: verbose name} for the summed activity metrics."""
+        from core.models import Activity
+
+        return {
+            name: str(self.get_field_label(Activity._meta.get_field(name)))
+            for name in ACTIVITY_METRICS
+        }
+
+    def prepare_data(self):
+        """
+        Build the portfolio-wide summary row.
+        """
+        summary = self.summarize('portfolio').reset_index(drop=True)
+        self.table = _frame_to_table(summary)
+
+    def add_custom_sheets(self, writer):
+        """
+        Add the per-program, per-area and per-project sheets.
+
+        Args:
+            writer: Report writer from tabular.get_writer()
+        """
+        with self.profile.span('sheet:Por Programa'):
+            self.write_sheet(writer, _frame_to_table(self._program_frame()), 'Por Programa')
+
+        with self.profile.span('sheet:Por Área'):
+            self.write_sheet(writer, _frame_to_table(self._area_frame()), 'Por Área')
+
+        with self.profile.span('sheet:Proyectos'):
+            self.write_sheet(writer, _frame_to_table(self._project_frame()), 'Proyectos')
+
+    def _program_display(self, codes):
+        from core.models import Project
+
+        labels = dict(Project.PROGRAM_CHOICES)
+        return codes.map(lambda code: labels.get(code, code or 'Sin programa'))
+
+    def _program_frame(self):
+        summary = self.summarize('program').sort_index()
+        summary.insert(0, 'Programa', self._program_display(summary.index.to_series()))
+        return summary.reset_index(drop=True)
+
+    def _area_frame(self):
+        """Activity metric totals by project program and activity area."""
+        from core.models import Activity
+
+        activities = self._load_frames()['activities']
+        metric_labels = self.get_activity_metric_labels()
+
+        grouped = activities.assign(area=activities['area'].fillna(''))
+        areas = grouped.groupby(['program', 'area'])
+        frame = areas[ACTIVITY_METRICS].sum().rename(columns=metric_labels)
+        frame.insert(0, ACTIVITIES, areas.size())
+        frame = frame.reset_index()
+
+        area_labels = dict(Activity.PROGRAM_CHOICES)
+        frame['program'] = self._program_display(frame['program'])
+        frame['area'] = frame['area'].map(lambda code: area_labels.get(code, code or 'Sin área'))
+        return frame.rename(columns={'program': 'Programa', 'area': 'Área de la actividad'})
+
+    def _project_frame(self):
+        from core.models import Project
+
+        projects = self._load_frames()['projects'].set_index('project_id')
+        summary = self.summarize('project_id').drop(columns=[PROJECTS])
+
+        status_labels = dict(Project.STATUS_CHOICES)
+        summary.insert(0, 'Proyecto', projects['name'])
+        summary.insert(1, 'Programa', self._program_display(projects['program']))
+        summary.insert(2, 'Estado', projects['status'].map(lambda code: status_labels.get(code, code)))
+        return summary.sort_values('Proyecto').reset_index(drop=True)
+
+    def _get_report_prefix(self) -> str:
+        return 'Portafolio'
+
+    def _get_primary_name_for_filename(self) -> str:
+        return 'Proyectos'
+
+    def _get_primary_date_for_filename(self):
+        return datetime.now()
+
+    def _get_profile_label(self) -> str:
+        return self.__class__.__name__
+
+    def validate_instance(self):
+        """
+        The portfolio covers every project, so there is no instance to validate.
+        """
+        return True, None
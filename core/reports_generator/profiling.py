@@ -0,0 +1,142 @@
+"""
+reports/generators/profiling.py
+Lightweight instrumentation for report generation
+"""
+import logging
+import re
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, List
+
+from django.db import connection
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+class _QueryCounter:
+    """Database execute wrapper that counts executed queries."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class GenerationProfile:
+    """
+    Collects timing spans, query counts and peak memory for one report generation.
+
+    Usage:
+        profile = GenerationProfile()
+        with profile.track('project #3'):
+            with profile.span('prepare_data'):
+                ...
+        profile.as_dict()
+    """
+
+    def __init__(self, trace_memory=False):
+        """
+        Args:
+            trace_memory: Measure peak Python allocations with tracemalloc.
+                Accurate but slows generation down, so it is opt-in.
+        """
+        self.trace_memory = trace_memory
+        self.label = ''
+        self.spans: List[Dict[str, Any]] = []
+        self.total_ms = 0.0
+        self.total_queries = 0
+        self.peak_memory_bytes = None
+        self.peak_rss_kb = None
+        self._counter = _QueryCounter()
+
+    @contextmanager
+    def span(self, name: str):
+        """Time a block of work and count the queries it executed."""
+        start_queries = self._counter.count
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans.append({
+                'name': name,
+                'duration_ms': round((time.perf_counter() - start) * 1000, 2),
+                'queries': self._counter.count - start_queries,
+            })
+
+    @contextmanager
+    def track(self, label: str = ''):
+        """
+        Wrap a whole generation: installs the query counter, optionally traces
+        memory, and logs the collected profile when the block finishes.
+        """
+        self.label = label
+        started_tracing = False
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracing = True
+        elif self.trace_memory:
+            tracemalloc.reset_peak()
+
+        start = time.perf_counter()
+        try:
+            with connection.execute_wrapper(self._counter):
+                yield self
+        finally:
+            self.total_ms = round((time.perf_counter() - start) * 1000, 2)
+            self.total_queries = self._counter.count
+            if self.trace_memory:
+                self.peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+                if started_tracing:
+                    tracemalloc.stop()
+            if resource is not None:
+                self.peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            self.log()
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the profile as a JSON-serializable dictionary."""
+        return {
+            'label': self.label,
+            'total_ms': self.total_ms,
+            'queries': self.total_queries,
+            'peak_memory_bytes': self.peak_memory_bytes,
+            'peak_rss_kb': self.peak_rss_kb,
+            'spans': self.spans,
+        }
+
+    def log(self):
+        """Emit the profile as a structured log record (see ``extra['report_profile']``)."""
+        slowest = sorted(self.spans, key=lambda s: s['duration_ms'], reverse=True)[:3]
+        logger.info(
+            "Report %s generated in %.1f ms (%d queries); slowest: %s",
+            self.label,
+            self.total_ms,
+            self.total_queries,
+            ', '.join(f"{s['name']}={s['duration_ms']}ms" for s in slowest),
+            extra={'report_profile': self.as_dict()},
+        )
+
+    def server_timing(self) -> str:
+        """
+        Format the spans as a ``Server-Timing`` header value so the breakdown
+        shows up in the browser's network panel.
+        """
+        metrics = []
+        seen = {}
+        for span in self.spans:
+            token = re.sub(r'[^A-Za-z0-9_-]+', '-', span['name']).strip('-') or 'span'
+            seen[token] = seen.get(token, 0) + 1
+            if seen[token] > 1:
+                token = f'{token}-{seen[token]}'
+            metrics.append(
+                f'{token};dur={span["duration_ms"]};desc="{span["queries"]} queries"'
+            )
+        metrics.append(f'total;dur={self.total_ms};desc="{self.total_queries} queries"')
+        return ', '.join(metrics)
@@ -2,7 +2,7 @@
 reports/generators/project.py
 Project-specific report generator
 """
-import pandas as pd
+from django.db.models import prefetch_related_objects
 from .base import BaseReportGenerator
 from .activity import ActivityReportGenerator
 from .event import EventReportGenerator
@@ -16,201 +16,138 @@ class ProjectReportGenerator(BaseReportGenerator):
     # Optional: Exclude specific fields from the report
     EXCLUDED_FIELDS = ['id']  # Inherit from base and add more if needed
     
+    def __init__(self, instance, include_custom_sheets=True):
+        super().__init__(instance, include_custom_sheets=include_custom_sheets)
+        self._activities = None
+        self._events = None
+    
+    def _load_related(self):
+        """
+        Load activities, events and the events' attendances in a single prefetch pass.
+        Every sheet and metric reads from these rows, so a project workbook costs a
+        constant number of queries regardless of how many related rows it has.
+        """
+        if self._events is not None:
+            return
+        prefetch_related_objects([self.instance], 'activities', 'events__attendances')
+        self._activities = list(self.instance.activities.all())
+        self._events = list(self.instance.events.all())
+    
+    def _iter_attendances(self):
+        """Yield (event, attendance) pairs from the prefetched events."""
+        self._load_related()
+        for event in self._events:
+            for attendance in event.attendances.all():
+                yield event, attendance
     
     def prepare_data(self):
         """
-        Convert Project instance to DataFrame using automatic extraction.
+        Convert Project instance to a Table using automatic extraction.
         Adds custom columns for related activities and events counts.
         """
+        self._load_related()
+        
         # Use the base class method to extract all model data automatically
         data = self.extract_model_data()
         
         # Add custom columns
-        data['Total  Actividades'] = self.instance.activities.count()
-        data['Total  Eventos'] = self.instance.events.count()
+        data['Total  Actividades'] = len(self._activities)
+        data['Total  Eventos'] = len(self._events)
         
         # Add event metrics if there are events
-        if self.instance.events.exists():
+        if self._events:
             data['Total de Participantes en Eventos'] = self._get_total_event_participants()
             data['Diversidad Geográfica en Eventos'] = self._get_total_geographic_diversity()
             data['Aceptabilidad Promedio en Eventos (Sección 3)'] = self._get_total_average_satisfaction()
             data['Tasa de Retención (2+ eventos) %'] = self._get_retention_rate()
         
-        self.df = pd.DataFrame([data])
+        self.table = self.to_table([data])
     
     def add_custom_sheets(self, writer):
         """
         Add sheets with all related activities and events for this project.
         
         Args:
-            writer: pandas ExcelWriter object
+            writer: Report writer from tabular.get_writer()
         """
-        self._add_activities_sheet(writer)
+        self._load_related()
+        
+        with self.profile.span('sheet:Actividades'):
+            self._add_activities_sheet(writer, self._activities)
         
-        self._add_events_sheet(writer)
+        with self.profile.span('sheet:Eventos'):
+            self._add_events_sheet(writer, self._events)
         
         # Add attendance sheet if there are events
-        if self.instance.events.exists():
-            self._add_attendance_sheet(writer)
+        if self._events:
+            with self.profile.span('sheet:Asistencias'):
+                self._add_attendance_sheet(writer, self._events)
     
-    def _add_activities_sheet(self, writer):
+    def _add_activities_sheet(self, writer, activities):
         """
         Add a sheet with all related activities for this project.
-        Uses ActivityReportGenerator without custom sheets to avoid nesting.
+        Uses one ActivityReportGenerator (without custom sheets) to extract every row.
         
         Args:
-            writer: pandas ExcelWriter object
-        """
-        activities = self.instance.activities.all()
-        
-        if activities.exists():
-            # Prepare activities data - use generator WITHOUT custom sheets
-            activities_data = []
-            for activity in activities:
-                # Pass include_custom_sheets=False to prevent nested sheets
-                activity_gen = ActivityReportGenerator(activity, include_custom_sheets=False)
-                activity_data = activity_gen.extract_model_data()
-                activities_data.append(activity_data)
-            
-            activities_df = pd.DataFrame(activities_data)
+            writer: Report writer from tabular.get_writer()
+            activities: Already-loaded Activity instances
+        """
+        if activities:
+            # Pass include_custom_sheets=False to prevent nested sheets
+            activity_gen = ActivityReportGenerator(None, include_custom_sheets=False)
+            activities_data = [
+                activity_gen.extract_model_data(activity) for activity in activities
+            ]
             
-            # Write to a new sheet
-            activities_df.to_excel(writer, index=False, sheet_name='Actividades')
+            activities_table = self.to_table(activities_data)
             
-            # Apply formatting using base class method
-            # Temporarily store the current df and use activities_df for formatting
-            original_df = self.df
-            self.df = activities_df
-            self.apply_formatting(writer, sheet_name='Actividades')
-            self.df = original_df
+            # Write to a new sheet and apply formatting
+            self.write_sheet(writer, activities_table, 'Actividades')
     
-    def _add_events_sheet(self, writer):
+    def _add_events_sheet(self, writer, events):
         """
         Add a sheet with all related events for this project.
-        Uses EventReportGenerator without custom sheets to avoid nesting.
+        Uses one EventReportGenerator (without custom sheets) to extract every row.
         
         Args:
-            writer: pandas ExcelWriter object
+            writer: Report writer from tabular.get_writer()
+            events: Already-loaded Event instances
         """
-        events = self.instance.events.all()
-        
-        if events.exists():
-            # Prepare events data - use generator WITHOUT custom sheets
+        if events:
+            # Pass include_custom_sheets=False to prevent nested sheets
+            event_gen = EventReportGenerator(None, include_custom_sheets=False)
             events_data = []
             for event in events:
-                # Pass include_custom_sheets=False to prevent nested sheets
-                event_gen = EventReportGenerator(event, include_custom_sheets=False)
-                event_data = event_gen.extract_model_data()
+                event_data = event_gen.extract_model_data(event)
                 
-                # Add event-specific metrics
-                event_data['Total de Participantes'] = event_gen._get_total_participants()
-                event_data['Diversidad Geográfica'] = event_gen._get_geographic_diversity()
-                event_data['Aceptabilidad Promedio (Sección 3)'] = event_gen._get_average_satisfaction()
+                # Add event-specific metrics from the stored attendance stats
+                event_data.update(event_gen.get_event_metrics(event))
                 
                 events_data.append(event_data)
             
-            events_df = pd.DataFrame(events_data)
-         
-            # Write to a new sheet
-            events_df.to_excel(writer, index=False, sheet_name='Eventos')
+            events_table = self.to_table(events_data)
          
-            # Apply formatting using base class method
-            original_df = self.df
-            self.df = events_df
-            self.apply_formatting(writer, sheet_name='Eventos')
-            self.df = original_df
+            # Write to a new sheet and apply formatting
+            self.write_sheet(writer, events_table, 'Eventos')
     
-    def _add_attendance_sheet(self, writer):
+    def _add_attendance_sheet(self, writer, events):
         """
         Add a sheet with all attendance records from all events in this project.
         
         Args:
-            writer: pandas ExcelWriter object
-        """
-        events = self.instance.events.all()
-        
-        if events.exists():
-            # Collect all attendance records from all events
-            attendance_data = []
-            
-            for event in events:
-                attendances = event.attendances.all()
-                
-                for attendance in attendances:
-                    # Extract attendance fields
-                    row = {
-                        'Evento': event.name,
-                    }
-                    
-                    # Add all attendance fields
-                    attendance_dict = self._extract_attendance_fields(attendance)
-                    row.update(attendance_dict)
-                    
-                    attendance_data.append(row)
-            
-            if attendance_data:
-                attendance_df = pd.DataFrame(attendance_data)
-                
-                # Write to a new sheet
-                attendance_df.to_excel(writer, index=False, sheet_name='Asistencias')
-                
-                # Apply formatting
-                original_df = self.df
-                self.df = attendance_df
-                self.apply_formatting(writer, sheet_name='Asistencias')
-                self.df = original_df
-    
-    def _extract_attendance_fields(self, attendance):
-        """
-        Extract all fields from an Attendance model instance.
-        Handles field formatting and display values.
-        
-        Args:
-            attendance: Attendance model instance
-        
-        Returns:
-            Dictionary with formatted attendance data
-        """
-        from core.models import Attendance
-        
-        data = {}
-        
-        # Get all fields from Attendance model
-        fields = Attendance._meta.get_fields()
-        
-        for field in fields:
-            # Skip excluded fields and reverse relations
-            if field.name in ['id', 'event']:  # Skip primary key and foreign key to Event
-                continue
-            
-            # Skip reverse relations
-            if field.one_to_many or field.many_to_many:
-                continue
+            writer: Report writer from tabular.get_writer()
+            events: Already-loaded Event instances with prefetched attendances
+        """
+        if any(event.attendances.all() for event in events):
+            # Rows are extracted while the sheet is written
+            event_gen = EventReportGenerator(None, include_custom_sheets=False)
+            attendance_table = self.to_table(
+                event_gen.iter_attendance_rows(events),
+                columns=event_gen.get_attendance_columns(),
+            )
             
-            # Get label and value using base class methods
-            label = self.get_field_label(field)
-            
-            # Get the value from the attendance instance
-            value = getattr(attendance, field.name)
-            
-            # Handle different field types
-            if field.choices:
-                # Get the display value for choice fields
-                get_display_method = f'get_{field.name}_display'
-                if hasattr(attendance, get_display_method):
-                    value = getattr(attendance, get_display_method)()
-            elif hasattr(field, '__class__') and 'DateTimeField' in field.__class__.__name__:
-                value = self.format_date(value, include_time=True)
-            elif hasattr(field, '__class__') and 'DateField' in field.__class__.__name__:
-                value = self.format_date(value, include_time=False)
-            
-            # Handle None values
-            if value is None:
-                value = ''
-            
-            data[label] = value
-        
-        return data
+            # Write to a new sheet and apply formatting
+            self.write_sheet(writer, attendance_table, 'Asistencias')
     
     def _get_total_event_participants(self):
         """
@@ -219,10 +156,7 @@ class ProjectReportGenerator(BaseReportGenerator):
         Returns:
             int: Total number of attendance records across all events
         """
-        total = 0
-        for event in self.instance.events.all():
-            total += event.attendances.count()
-        return total
+        return sum(1 for _event, _attendance in self._iter_attendances())
     
     def _get_total_geographic_diversity(self):
         """
@@ -234,10 +168,9 @@ class ProjectReportGenerator(BaseReportGenerator):
         """
         departments = set()
         
-        for event in self.instance.events.all():
-            for attendance in event.attendances.all():
-                if attendance.department and attendance.department.strip():
-                    departments.add(attendance.department)
+        for _event, attendance in self._iter_attendances():
+            if attendance.department and attendance.department.strip():
+                departments.add(attendance.department)
         
         return len(departments)
     
@@ -251,10 +184,9 @@ class ProjectReportGenerator(BaseReportGenerator):
         total_satisfaction = 0
         count = 0
         
-        for event in self.instance.events.all():
-            for attendance in event.attendances.all():
-                total_satisfaction += attendance.average_satisfaction_score
-                count += 1
+        for _event, attendance in self._iter_attendances():
+            total_satisfaction += attendance.average_satisfaction_score
+            count += 1
         
         if count == 0:
             return 0
@@ -267,38 +199,16 @@ class ProjectReportGenerator(BaseReportGenerator):
         Calculate retention rate as the percentage of unique participants who 
         participated in 2 or more events within this project.
         
-        Uses wiki_username as the primary identifier, falling back to email if needed.
+        Participants are the linked Participant rows (normalized email or
+        wiki_username), counted with one GROUP BY query.
         
         Returns:
             float: Retention rate percentage (rounded to 2 decimals), or 0 if no data
         """
-        # Collect all participants and count their event participation
-        participant_events = {}  # {identifier: set(event_ids)}
-        
-        for event in self.instance.events.all():
-            for attendance in event.attendances.all():
-                # Use wiki_username if available, otherwise use email
-                identifier = attendance.wiki_username if attendance.wiki_username else attendance.email
-                
-                if identifier:
-                    if identifier not in participant_events:
-                        participant_events[identifier] = set()
-                    participant_events[identifier].add(event.id)
-        
-        # If no participants, return 0
-        if not participant_events:
-            return 0
-        
-        # Count total unique participants
-        total_unique = len(participant_events)
-        
-        # Count participants who attended 2 or more events
-        repeat_participants = sum(1 for events in participant_events.values() if len(events) >= 2)
-        
-        # Calculate retention rate as percentage
-        retention_rate = (repeat_participants / total_unique) * 100
-        
-        return round(retention_rate, 2)
+        from core.models import Attendance
+        from core.participants import get_retention_rate
+
+        return get_retention_rate(Attendance.objects.filter(event__proyecto=self.instance))
     
     def validate_instance(self):
         """
@@ -0,0 +1,315 @@
+"""
+reports/generators/tabular.py
+Minimal tabular layer for report generation: column specs plus row iterators,
+written straight to XLSX (openpyxl), CSV or JSON without building DataFrames.
+"""
+import csv
+import io
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+# Rows sampled per column to size XLSX column widths
+WIDTH_SAMPLE_ROWS = 5
+
+# First characters that make a spreadsheet treat a CSV cell as a formula
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+FILE_FORMATS = {
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'csv': 'text/csv; charset=utf-8',
+    'json': 'application/json',
+}
+
+
+@dataclass(frozen=True)
+class Column:
+    """
+    A report column.
+
+    Attributes:
+        key: Key used to read the value from a record dictionary
+        label: Header shown in the file (defaults to key)
+    """
+    key: str
+    label: Optional[str] = None
+
+    @property
+    def header(self) -> str:
+        return str(self.label if self.label is not None else self.key)
+
+
+class Table:
+    """
+    A sheet's worth of data: columns plus an iterable of rows.
+
+    Rows are consumed once, while the file is being written, so they can come
+    from a generator and never need to be held in memory all at once.
+
+    Usage:
+        table = Table.from_records([{'Nombre': 'Taller', 'Participantes': 12}])
+        table = Table.from_records(iter_rows(), columns=[Column('Nombre'), ...])
+    """
+
+    def __init__(self, columns: Sequence[Column], rows: Iterable[Sequence[Any]]):
+        """
+        Args:
+            columns: Column specs, in output order
+            rows: Iterable of value sequences aligned with columns
+        """
+        self.columns = list(columns)
+        self._rows = rows
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]], columns: Optional[Sequence[Column]] = None):
+        """
+        Build a table from row dictionaries.
+
+        Args:
+            records: Row dictionaries. If columns is None they must be a
+                re-iterable collection (e.g. a list); the columns are then the
+                union of all keys in first-seen order and missing keys are blank.
+            columns: Column specs; lets records be a one-shot iterator
+
+        Returns:
+            Table
+        """
+        if columns is None:
+            records = list(records)
+            keys = {}
+            for record in records:
+                keys.update(dict.fromkeys(record))
+            columns = [Column(key) for key in keys]
+
+        keys = [column.key for column in columns]
+        rows = (tuple(record.get(key) for key in keys) for record in records)
+        return cls(columns, rows)
+
+    @property
+    def headers(self) -> List[str]:
+        return [column.header for column in self.columns]
+
+    def __iter__(self) -> Iterator[Sequence[Any]]:
+        return iter(self._rows)
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Consume the rows and return them as dictionaries keyed by header."""
+        headers = self.headers
+        return [dict(zip(headers, row)) for row in self]
+
+
+def cell_value(value):
+    """Normalize a value to a type every writer can serialize."""
+    if hasattr(value, 'item') and not isinstance(value, Decimal):
+        # NumPy scalars from vectorized aggregations
+        value = value.item()
+    if isinstance(value, float) and value != value:
+        # NaN is a missing value
+        return None
+    if value is None or isinstance(value, (str, bool, int, float, Decimal, date, datetime)):
+        return value
+    return str(value)
+
+
+class XlsxWriter:
+    """
+    Writes tables as worksheets of an openpyxl workbook.
+
+    Mirrors the parts of pandas' ExcelWriter the generators use (``book``,
+    ``sheets`` and ``close()``), so formatting hooks keep working.
+    """
+
+    file_format = 'xlsx'
+
+    def __init__(self, target):
+        """
+        Args:
+            target: Path or binary file-like object to save the workbook to
+        """
+        from openpyxl import Workbook
+
+        self.target = target
+        self.book = Workbook()
+        self.book.remove(self.book.active)
+        self.sheets = {}
+        # Headers and the first WIDTH_SAMPLE_ROWS rows of each sheet
+        self.samples = {}
+
+    def write(self, table: Table, sheet_name: str):
+        worksheet = self.book.create_sheet(title=sheet_name)
+        headers = table.headers
+        worksheet.append(headers)
+
+        sample = []
+        for row in table:
+            row = [cell_value(value) for value in row]
+            if len(sample) < WIDTH_SAMPLE_ROWS:
+                sample.append(row)
+            worksheet.append(row)
+
+        self.sheets[sheet_name] = worksheet
+        self.samples[sheet_name] = (headers, sample)
+
+    def close(self):
+        if not self.book.worksheets:
+            self.book.create_sheet(title='Datos')
+        self.book.save(self.target)
+
+
+class _RecordsWriter:
+    """Base for the flat-file writers: keeps only the sheets that are exported."""
+
+    def __init__(self, target, sheet: Optional[str] = None):
+        """
+        Args:
+            target: Path or binary file-like object
+            sheet: Only export this sheet (None exports the writer's default)
+        """
+        self.target = target
+        self.sheet = sheet
+        self.sheets = {}
+        self.samples = {}
+
+    def _open(self):
+        if isinstance(self.target, (str, bytes)) or hasattr(self.target, '__fspath__'):
+            return open(self.target, 'w', encoding=self.encoding, newline='')
+        return io.TextIOWrapper(self.target, encoding=self.encoding, newline='', write_through=True)
+
+    def _finish(self, stream):
+        if isinstance(stream, io.TextIOWrapper) and stream.buffer is self.target:
+            # Leave the caller's buffer open
+            stream.flush()
+            stream.detach()
+        else:
+            stream.close()
+
+
+class CsvWriter(_RecordsWriter):
+    """
+    Writes a single table as CSV (UTF-8 with BOM so Excel detects the encoding).
+    Only the requested sheet is written; by default the main 'Datos' sheet.
+    """
+
+    file_format = 'csv'
+    encoding = 'utf-8-sig'
+
+    def __init__(self, target, sheet: Optional[str] = None):
+        super().__init__(target, sheet or 'Datos')
+        self._written = False
+
+    def write(self, table: Table, sheet_name: str):
+        if sheet_name != self.sheet:
+            return
+        stream = self._open()
+        try:
+            writer = csv.writer(stream)
+            writer.writerow(table.headers)
+            writer.writerows(
+                [_csv_value(cell_value(value)) for value in row] for row in table
+            )
+        finally:
+            self._finish(stream)
+        self._written = True
+
+    def close(self):
+        if not self._written:
+            raise ValueError(f"La hoja '{self.sheet}' no existe en este reporte")
+
+
+class JsonWriter(_RecordsWriter):
+    """
+    Writes every table as ``{"<sheet name>": [{"<header>": value, ...}, ...]}``.
+    Rows are encoded one at a time; a sheet filter exports just that sheet.
+    """
+
+    file_format = 'json'
+    encoding = 'utf-8'
+
+    def __init__(self, target, sheet: Optional[str] = None):
+        super().__init__(target, sheet)
+        self._stream = None
+
+    def write(self, table: Table, sheet_name: str):
+        if self.sheet and sheet_name != self.sheet:
+            return
+        if self._stream is None:
+            self._stream = self._open()
+            self._stream.write('{')
+        else:
+            self._stream.write(',')
+
+        stream = self._stream
+        stream.write(json.dumps(sheet_name, ensure_ascii=False) + ':[')
+        headers = table.headers
+        for index, row in enumerate(table):
+            if index:
+                stream.write(',')
+            record = dict(zip(headers, (cell_value(value) for value in row)))
+            stream.write(json.dumps(record, ensure_ascii=False, default=_json_default))
+        stream.write(']')
+
+    def close(self):
+        if self._stream is None:
+            if self.sheet:
+                raise ValueError(f"La hoja '{self.sheet}' no existe en este reporte")
+            self._stream = self._open()
+            self._stream.write('{')
+        self._stream.write('}')
+        self._finish(self._stream)
+
+
+def escape_csv_formula(value):
+    """
+    Prefix text that a spreadsheet would run as a formula with an apostrophe.
+
+    Report cells carry answers from the public attendance form; opened in Excel
+    or LibreOffice, a cell such as ``=HYPERLINK(...)`` would otherwise execute.
+    """
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _csv_value(value):
+    if isinstance(value, bool):
+        return 'Sí' if value else 'No'
+    return escape_csv_formula(value)
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+WRITERS: Dict[str, Callable] = {
+    'xlsx': XlsxWriter,
+    'csv': CsvWriter,
+    'json': JsonWriter,
+}
+
+
+def get_writer(file_format: str, target, sheet: Optional[str] = None):
+    """
+    Return a writer for the given output format.
+
+    Args:
+        file_format: One of FILE_FORMATS
+        target: Path or binary file-like object
+        sheet: For CSV/JSON, export only this sheet
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    if file_format not in WRITERS:
+        raise ValueError(
+            f"Unknown report format: {file_format}. Valid formats: {', '.join(WRITERS)}"
+        )
+    if file_format == 'xlsx':
+        return XlsxWriter(target)
+    return WRITERS[file_format](target, sheet)
+
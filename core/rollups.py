@@ -0,0 +1,147 @@
+"""
+Monthly rollups of the activity metrics.
+
+``ActivityMetricRollup`` keeps one row per (month, project, area) with the
+activity count and the sum of every metric in ``Activity.METRIC_FIELDS``.
+Saving or deleting an activity recomputes only the bucket(s) it belongs to
+(see core/signals.py); ``rebuild_activity_rollups()`` rebuilds the whole table
+after bulk imports or raw SQL, which bypass the signals.
+
+Trend queries (``get_metric_trends``) group the rollup rows by month, quarter
+or year, so they read at most one row per bucket instead of every activity.
+"""
+from datetime import date
+
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth, TruncQuarter, TruncYear
+
+from .models import Activity, ActivityMetricRollup
+
+PERIODS = {
+    "month": TruncMonth,
+    "quarter": TruncQuarter,
+    "year": TruncYear,
+}
+
+
+def month_start(value) -> date:
+    """Return the first day of the month of a date."""
+    return value.replace(day=1)
+
+
+def get_bucket(activity):
+    """Return the (month, project_id, area) rollup bucket of an activity."""
+    return (month_start(activity.date), activity.project_id, activity.area or "")
+
+
+def _next_month(month):
+    return date(month.year + (month.month == 12), month.month % 12 + 1, 1)
+
+
+def _sum_metrics(count_expression):
+    """Aggregate expressions for the activity count and every metric total."""
+    aggregates = {"total_activity_count": count_expression}
+    aggregates.update({f"total_{field}": Sum(field) for field in Activity.METRIC_FIELDS})
+    return aggregates
+
+
+def _totals(row):
+    """Map 'total_<field>' aggregate results back to rollup field values."""
+    return {
+        field: row[f"total_{field}"] or 0
+        for field in ("activity_count", *Activity.METRIC_FIELDS)
+    }
+
+
+def refresh_bucket(month, project_id, area):
+    """
+    Recompute a single rollup row from the activities in its bucket.
+    Deletes the row when the bucket no longer has activities.
+    """
+    totals = Activity.objects.filter(
+        project_id=project_id,
+        area=area,
+        date__gte=month,
+        date__lt=_next_month(month),
+    ).aggregate(**_sum_metrics(Count("pk")))
+    totals = _totals(totals)
+
+    with transaction.atomic():
+        if not totals["activity_count"]:
+            ActivityMetricRollup.objects.filter(month=month, project_id=project_id, area=area).delete()
+            return None
+        rollup, _created = ActivityMetricRollup.objects.update_or_create(
+            month=month,
+            project_id=project_id,
+            area=area,
+            defaults=totals,
+        )
+    return rollup
+
+
+def rebuild_activity_rollups():
+    """
+    Rebuild the whole rollup table with one grouped query.
+
+    Returns:
+        int: Number of rollup rows written
+    """
+    rows = (
+        Activity.objects.annotate(month=TruncMonth("date"))
+        .values("month", "project_id", "area")
+        .annotate(**_sum_metrics(Count("pk")))
+        .order_by()
+    )
+    rollups = [
+        ActivityMetricRollup(
+            month=row["month"],
+            project_id=row["project_id"],
+            area=row["area"],
+            **_totals(row),
+        )
+        for row in rows
+    ]
+    with transaction.atomic():
+        ActivityMetricRollup.objects.all().delete()
+        ActivityMetricRollup.objects.bulk_create(rollups, batch_size=500)
+    return len(rollups)
+
+
+def get_metric_trends(period="month", project=None, area=None, start=None, end=None):
+    """
+    Metric totals per period, read from the rollup table.
+
+    Args:
+        period: 'month', 'quarter' or 'year'
+        project: Only this project (instance or id)
+        area: Only this activity area code
+        start: First day included (date)
+        end: Last day included (date)
+
+    Returns:
+        list: One dict per period with 'period', 'activity_count' and each metric
+
+    Raises:
+        ValueError: If the period is unknown
+    """
+    if period not in PERIODS:
+        raise ValueError(f"Unknown period: {period}. Valid periods: {', '.join(PERIODS)}")
+
+    rollups = ActivityMetricRollup.objects.all()
+    if project is not None:
+        rollups = rollups.filter(project=project)
+    if area is not None:
+        rollups = rollups.filter(area=area)
+    if start is not None:
+        rollups = rollups.filter(month__gte=month_start(start))
+    if end is not None:
+        rollups = rollups.filter(month__lte=end)
+
+    rows = (
+        rollups.annotate(period=PERIODS[period]("month"))
+        .values("period")
+        .annotate(**_sum_metrics(Sum("activity_count")))
+        .order_by("period")
+    )
+    return [{"period": row["period"], **_totals(row)} for row in rows]
@@ -0,0 +1,103 @@
+"""
+Signal handlers that keep derived tables in sync with the core models.
+Connected in CoreConfig.ready().
+"""
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
+from django.dispatch import receiver
+
+from . import event_lookup, survey_analytics, survey_terms
+from .participants import link_participants
+from .event_stats import refresh_event_attendance_stats
+from .models import Activity, Attendance, Event
+from .rollups import get_bucket, refresh_bucket
+
+_BUCKET_FIELDS = {"date", "project_id", "area"}
+_FREE_TEXT_FIELDS = set(Attendance.FREE_TEXT_FIELDS)
+
+
+@receiver(post_init, sender=Activity)
+def remember_activity_bucket(sender, instance, **kwargs):
+    """Remember the rollup bucket an activity was loaded with, to refresh it if it moves."""
+    if instance.pk is not None and _BUCKET_FIELDS <= instance.__dict__.keys():
+        instance._rollup_bucket = get_bucket(instance)
+    else:
+        instance._rollup_bucket = None
+
+
+@receiver(post_save, sender=Activity)
+def refresh_rollups_on_activity_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    bucket = get_bucket(instance)
+    refresh_bucket(*bucket)
+    previous = instance._rollup_bucket
+    if previous is not None and previous != bucket:
+        refresh_bucket(*previous)
+    instance._rollup_bucket = bucket
+
+
+@receiver(post_delete, sender=Activity)
+def refresh_rollups_on_activity_delete(sender, instance, **kwargs):
+    refresh_bucket(*(instance._rollup_bucket or get_bucket(instance)))
+
+
+@receiver(post_init, sender=Attendance)
+def remember_attendance_texts(sender, instance, **kwargs):
+    """Remember the free-text answers an attendance was loaded with, to reindex edits."""
+    if instance.pk is not None and _FREE_TEXT_FIELDS <= instance.__dict__.keys():
+        instance._indexed_texts = survey_terms.get_texts(instance)
+    else:
+        instance._indexed_texts = None
+    # Participant identity it was loaded with, to relink only when it changes
+    instance._linked_participant_key = instance.__dict__.get("participant_key") if instance.pk else None
+
+
+@receiver(pre_save, sender=Attendance)
+def link_participant_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    if instance.participant_id is None or instance.participant_key != instance._linked_participant_key:
+        link_participants([instance])
+        instance._linked_participant_key = instance.participant_key
+
+
+@receiver(post_save, sender=Attendance)
+def update_attendance_aggregates_on_save(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        refresh_event_attendance_stats(instance.event_id)
+        survey_terms.index_attendance(instance)
+        _invalidate_survey_analytics(instance)
+    elif instance._indexed_texts is not None:
+        survey_terms.reindex_attendance(instance, instance._indexed_texts)
+    instance._indexed_texts = survey_terms.get_texts(instance)
+
+
+@receiver(post_delete, sender=Attendance)
+def update_attendance_aggregates_on_delete(sender, instance, origin=None, **kwargs):
+    # Skip cascades from deleting the event (or its project) itself
+    origin_model = getattr(origin, "model", type(origin))
+    if origin is None or origin_model is Attendance:
+        refresh_event_attendance_stats(instance.event_id)
+        survey_terms.unindex_attendance(instance, instance._indexed_texts)
+        _invalidate_survey_analytics(instance)
+
+
+@receiver(post_save, sender=Event)
+def invalidate_event_lookup_on_event_save(sender, instance, raw=False, **kwargs):
+    event_lookup.invalidate(instance.attendance_token)
+
+
+@receiver(post_delete, sender=Event)
+def invalidate_caches_on_event_delete(sender, instance, **kwargs):
+    event_lookup.invalidate(instance.attendance_token)
+    survey_analytics.invalidate(event_id=instance.pk, project_id=instance.proyecto_id)
+
+
+def _invalidate_survey_analytics(attendance):
+    if Attendance.event.is_cached(attendance):
+        project_id = attendance.event.proyecto_id
+    else:
+        project_id = Event.objects.filter(pk=attendance.event_id).values_list("proyecto_id", flat=True).first()
+    survey_analytics.invalidate(event_id=attendance.event_id, project_id=project_id)
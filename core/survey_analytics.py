@@ -0,0 +1,194 @@
+"""
+Attendance survey analytics: answer distributions, means with 95% confidence
+intervals and a department heatmap, globally or per project or event.
+
+Everything is computed with two grouped aggregate queries per scope (one for
+the distributions and moments, one grouped by department), so the cost does
+not depend on Python iterating over responses. Results are cached per scope,
+tagged with the event, project or global scope they cover, and those tags are
+invalidated whenever an attendance is created or deleted (see
+core/signals.py); ``SURVEY_ANALYTICS_CACHE_TIMEOUT`` bounds how long a worker
+with a process-local cache can serve a stale copy.
+"""
+import math
+
+from django.conf import settings
+from django.db.models import Avg, Count, F, Q
+from django.utils import timezone
+
+from .cache import CacheNamespace, invalidate_tags
+from .event_stats import SATISFACTION_FIELDS
+from .models import Attendance
+
+analytics_cache = CacheNamespace("survey-analytics")
+LIKERT_VALUES = (1, 2, 3, 4, 5)
+# Two-sided 95% normal quantile
+Z_95 = 1.96
+
+CHOICE_FIELDS = ("activity_incidence", "future_participation", "attendance_mode")
+
+
+def get_cache_tag(scope, object_id=None):
+    """Tag of the cached analytics of 'global', ('project', id) or ('event', id)."""
+    if scope == "global":
+        return "survey-analytics:global"
+    return f"survey-analytics:{scope}:{object_id}"
+
+
+def invalidate(event_id=None, project_id=None):
+    """Expire the cached analytics of an event, its project and the global scope."""
+    tags = [get_cache_tag("global")]
+    if event_id is not None:
+        tags.append(get_cache_tag("event", event_id))
+    if project_id is not None:
+        tags.append(get_cache_tag("project", project_id))
+    invalidate_tags(*tags)
+
+
+def get_survey_analytics(scope="global", object_id=None):
+    """
+    Return the survey analytics of a scope, from the cache when possible.
+
+    Args:
+        scope: 'global', 'project' or 'event'
+        object_id: Project or event id for the non-global scopes
+
+    Raises:
+        ValueError: If the scope is unknown
+    """
+    return analytics_cache.get_or_set(
+        (scope, object_id),
+        lambda: compute_survey_analytics(_scope_queryset(scope, object_id)),
+        timeout=settings.SURVEY_ANALYTICS_CACHE_TIMEOUT,
+        tags=[get_cache_tag(scope, object_id)],
+    )
+
+
+def _scope_queryset(scope, object_id):
+    if scope == "global":
+        return Attendance.objects.all()
+    if scope == "project":
+        return Attendance.objects.filter(event__proyecto_id=object_id)
+    if scope == "event":
+        return Attendance.objects.filter(event_id=object_id)
+    raise ValueError(f"Unknown analytics scope: {scope}")
+
+
+def _confidence_interval(n, mean, mean_of_squares):
+    """Return (std, low, high) of a sample from its first two moments."""
+    if not n:
+        return None, None, None
+    if n < 2:
+        return 0.0, mean, mean
+    variance = max(mean_of_squares - mean * mean, 0) * n / (n - 1)
+    std = math.sqrt(variance)
+    margin = Z_95 * std / math.sqrt(n)
+    return std, mean - margin, mean + margin
+
+
+def _percent(count, total):
+    return round(count * 100 / total, 1) if total else 0
+
+
+def _heat(mean):
+    """Opacity for a heatmap cell: 0 for a mean of 1, 1 for a mean of 5."""
+    if mean is None:
+        return 0
+    return round(max(min((mean - 1) / 4, 1), 0), 2)
+
+
+def compute_survey_analytics(queryset):
+    """
+    Compute the analytics for a queryset of attendances.
+
+    Returns:
+        dict: JSON/pickle-friendly structure used by the analytics template
+    """
+    score_total = sum((F(field) for field in SATISFACTION_FIELDS[1:]), F(SATISFACTION_FIELDS[0]))
+
+    aggregates = {
+        "total": Count("pk"),
+        "score__avg": Avg(score_total),
+        "score__sq": Avg(score_total * score_total),
+    }
+    for field in SATISFACTION_FIELDS:
+        aggregates[f"{field}__avg"] = Avg(field)
+        aggregates[f"{field}__sq"] = Avg(F(field) * F(field))
+        for value in LIKERT_VALUES:
+            aggregates[f"{field}__{value}"] = Count("pk", filter=Q(**{field: value}))
+    for field in CHOICE_FIELDS:
+        for value, _label in Attendance._meta.get_field(field).choices:
+            aggregates[f"{field}__{value}"] = Count("pk", filter=Q(**{field: value}))
+
+    row = queryset.aggregate(**aggregates)
+    total = row["total"]
+
+    items = []
+    for field in SATISFACTION_FIELDS:
+        mean = row[f"{field}__avg"]
+        std, low, high = _confidence_interval(total, mean, row[f"{field}__sq"])
+        items.append({
+            "field": field,
+            "label": str(Attendance._meta.get_field(field).verbose_name),
+            "mean": mean,
+            "std": std,
+            "ci_low": low,
+            "ci_high": high,
+            "distribution": [
+                {
+                    "value": value,
+                    "count": row[f"{field}__{value}"],
+                    "percent": _percent(row[f"{field}__{value}"], total),
+                }
+                for value in LIKERT_VALUES
+            ],
+        })
+
+    items_count = len(SATISFACTION_FIELDS)
+    overall_mean = row["score__avg"] / items_count if total else None
+    overall_sq = row["score__sq"] / (items_count * items_count) if total else None
+    overall_std, overall_low, overall_high = _confidence_interval(total, overall_mean, overall_sq)
+
+    choices = []
+    for field in CHOICE_FIELDS:
+        model_field = Attendance._meta.get_field(field)
+        options = [
+            {"label": label, "count": row[f"{field}__{value}"], "percent": _percent(row[f"{field}__{value}"], total)}
+            for value, label in model_field.choices
+        ]
+        unanswered = total - sum(option["count"] for option in options)
+        if unanswered:
+            options.append({"label": "Sin respuesta", "count": unanswered, "percent": _percent(unanswered, total)})
+        choices.append({"field": field, "label": str(model_field.verbose_name), "options": options})
+
+    return {
+        "total": total,
+        "overall": {"mean": overall_mean, "std": overall_std, "ci_low": overall_low, "ci_high": overall_high},
+        "items": items,
+        "choices": choices,
+        "departments": _department_heatmap(queryset),
+        "generated_at": timezone.now(),
+    }
+
+
+def _department_heatmap(queryset):
+    """Responses and mean of each item per department, most represented first."""
+    labels = dict(Attendance.DepartmentChoices.choices)
+    rows = (
+        queryset.values("department")
+        .annotate(
+            responses=Count("pk"),
+            **{f"{field}__avg": Avg(field) for field in SATISFACTION_FIELDS},
+        )
+        .order_by("-responses", "department")
+    )
+    heatmap = []
+    for row in rows:
+        means = [row[f"{field}__avg"] for field in SATISFACTION_FIELDS]
+        heatmap.append({
+            "department": row["department"],
+            "label": labels.get(row["department"]) or "Sin departamento",
+            "responses": row["responses"],
+            "cells": [{"mean": mean, "heat": _heat(mean)} for mean in means],
+        })
+    return heatmap
@@ -0,0 +1,200 @@
+"""
+Free-text survey answers: term-frequency index and streamed export.
+
+``SurveyTermFrequency`` keeps, per event, how many times each term appears in
+``Attendance.FREE_TEXT_FIELDS``. Creating, editing or deleting an attendance
+adds or subtracts only that response's terms (see core/signals.py), so the top
+themes of an event or project are one grouped query over the index instead of
+re-tokenizing every answer. ``rebuild_survey_term_index()`` rebuilds it after
+bulk imports or raw SQL, which bypass the signals.
+"""
+import csv
+import re
+import unicodedata
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import F, Sum, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import Attendance, SurveyTermFrequency
+from .reports_generator.tabular import escape_csv_formula
+
+# Words of at least three letters (no digits or underscores)
+TOKEN_RE = re.compile(r"[^\W\d_]{3,}")
+MAX_TERM_LENGTH = SurveyTermFrequency._meta.get_field("term").max_length
+
+STOPWORDS = frozenset("""
+    algo algun alguna algunas alguno algunos ante antes aquel aquella aquellas
+    aquello aquellos aqui aquí asi así aun aún cada casi como cómo con contra cual
+    cuál cuales cuando cuándo cuanto del desde donde dónde durante ella ellas ello
+    ellos entre era eran eres esa esas ese eso esos esta está estaba estaban estado
+    estamos estan están estar estas estás este esto estos estoy fue fueron fui gran
+    había habia han has hasta hay hace hacer hizo las les los mas más mayor mejor
+    menos mia mía mio mío mis mismo mucha muchas mucho muchos muy nada nos nosotras
+    nosotros nuestra nuestras nuestro nuestros otra otras otro otros para pero poco
+    por porque puede pueden puedo que qué quien quién quienes ser será sería sido
+    sin sobre sólo solo son soy sus tal también tambien tan tanto tener tengo tiene
+    tienen toda todas todo todos tras tus una uno unos usted ustedes vez ver vos
+    the and for
+""".split())
+
+EXPORT_HEADERS = ("Evento", "Fecha de registro", "Departamento")
+
+
+def tokenize(text):
+    """Lower-cased terms of a text, without stopwords or very short words."""
+    if not text:
+        return []
+    text = unicodedata.normalize("NFC", text).lower()
+    return [
+        term for term in TOKEN_RE.findall(text)
+        if term not in STOPWORDS and len(term) <= MAX_TERM_LENGTH
+    ]
+
+
+def get_texts(attendance):
+    """Return the free-text answers of an attendance, in FREE_TEXT_FIELDS order."""
+    return tuple(getattr(attendance, field) for field in Attendance.FREE_TEXT_FIELDS)
+
+
+def count_terms(texts):
+    """Return a Counter of the terms in several texts."""
+    counts = Counter()
+    for text in texts:
+        counts.update(tokenize(text))
+    return counts
+
+
+def _apply_counts(event_id, counts, sign):
+    """Add (sign=1) or subtract (sign=-1) term counts from an event's index."""
+    if not counts:
+        return
+    terms_by_amount = defaultdict(list)
+    for term, amount in counts.items():
+        terms_by_amount[amount].append(term)
+
+    with transaction.atomic():
+        if sign > 0:
+            SurveyTermFrequency.objects.bulk_create(
+                [SurveyTermFrequency(event_id=event_id, term=term, count=0) for term in counts],
+                ignore_conflicts=True,
+            )
+        # One UPDATE per distinct amount (almost always just 1 and 2)
+        for amount, terms in terms_by_amount.items():
+            rows = SurveyTermFrequency.objects.filter(event_id=event_id, term__in=terms)
+            if sign > 0:
+                rows.update(count=F("count") + amount)
+            else:
+                rows.update(count=Greatest(F("count") - amount, Value(0)))
+        if sign < 0:
+            SurveyTermFrequency.objects.filter(event_id=event_id, term__in=list(counts), count=0).delete()
+
+
+def index_attendance(attendance, texts=None):
+    """Add an attendance's terms to its event's index."""
+    _apply_counts(attendance.event_id, count_terms(texts or get_texts(attendance)), 1)
+
+
+def unindex_attendance(attendance, texts=None):
+    """Remove an attendance's terms (or the given previous texts) from the index."""
+    _apply_counts(attendance.event_id, count_terms(texts or get_texts(attendance)), -1)
+
+
+def index_attendances(event_id, attendances):
+    """Add the terms of several attendances of one event (e.g. after bulk_create)."""
+    _apply_counts(event_id, count_terms(text for a in attendances for text in get_texts(a)), 1)
+
+
+def reindex_attendance(attendance, previous_texts):
+    """Apply only the difference between an attendance's previous and current texts."""
+    previous = count_terms(previous_texts)
+    current = count_terms(get_texts(attendance))
+    _apply_counts(attendance.event_id, current - previous, 1)
+    _apply_counts(attendance.event_id, previous - current, -1)
+
+
+def rebuild_survey_term_index(batch_size=1000):
+    """
+    Rebuild the whole index from the attendances, reading them once.
+
+    Returns:
+        int: Number of index rows written
+    """
+    counts = defaultdict(Counter)
+    rows = Attendance.objects.values_list("event_id", *Attendance.FREE_TEXT_FIELDS)
+    for event_id, *texts in rows.iterator(chunk_size=2000):
+        counts[event_id].update(count_terms(texts))
+
+    entries = [
+        SurveyTermFrequency(event_id=event_id, term=term, count=count)
+        for event_id, terms in counts.items()
+        for term, count in terms.items()
+    ]
+    with transaction.atomic():
+        SurveyTermFrequency.objects.all().delete()
+        SurveyTermFrequency.objects.bulk_create(entries, batch_size=batch_size)
+    return len(entries)
+
+
+def get_top_terms(event=None, project=None, limit=20):
+    """
+    Most frequent terms of an event, of a project's events or of every event.
+
+    Args:
+        event: Only this event (instance or id)
+        project: Only the events of this project (instance or id)
+        limit: Number of terms returned
+
+    Returns:
+        list: [{'term': str, 'count': int}, ...], most frequent first
+    """
+    entries = SurveyTermFrequency.objects.all()
+    if event is not None:
+        entries = entries.filter(event=event)
+    if project is not None:
+        entries = entries.filter(event__proyecto=project)
+    rows = (
+        entries.values("term")
+        .annotate(total=Sum("count"))
+        .order_by("-total", "term")[:limit]
+    )
+    return [{"term": row["term"], "count": row["total"]} for row in rows]
+
+
+class _Echo:
+    """File-like object whose write() returns the line, for csv.writer streaming."""
+
+    def write(self, value):
+        return value
+
+
+def iter_free_text_csv(attendances):
+    """
+    Yield CSV lines (UTF-8 with BOM) with the free-text answers of the given
+    attendances, skipping responses where every answer is blank.
+
+    The rows are read with values_list().iterator(), so memory use does not
+    grow with the number of responses.
+    """
+    labels = [
+        str(Attendance._meta.get_field(field).verbose_name)
+        for field in Attendance.FREE_TEXT_FIELDS
+    ]
+    departments = dict(Attendance.DepartmentChoices.choices)
+    writer = csv.writer(_Echo())
+
+    yield "\ufeff" + writer.writerow([*EXPORT_HEADERS, *labels])
+    rows = attendances.order_by("event_id", "created_at").values_list(
+        "event__name", "created_at", "department", *Attendance.FREE_TEXT_FIELDS
+    )
+    for event_name, created_at, department, *texts in rows.iterator(chunk_size=2000):
+        if not any(text and text.strip() for text in texts):
+            continue
+        yield writer.writerow([
+            event_name,
+            timezone.localtime(created_at).strftime("%Y-%m-%d %H:%M"),
+            departments.get(department, department),
+            *(escape_csv_formula(text or "") for text in texts),
+        ])
@@ -0,0 +1,71 @@
+{% load static %}{% autoescape off %}/**
+ * Service worker of the offline attendance form for one event.
+ *
+ * Precaches the form page and its assets, serves the page from the cache when
+ * the network is unavailable and caches other GET requests (CSS, scripts) on
+ * first use. Submissions are queued and synced by the page itself
+ * (js/attendance_offline.js); the worker never caches POST requests.
+ */
+const CACHE_PREFIX = "asistencia-{{ event.attendance_token }}-";
+const CACHE_NAME = CACHE_PREFIX + "v1";
+const OFFLINE_URL = "{% url 'offline_attendance' event.attendance_token %}";
+const PRECACHE_URLS = [
+    OFFLINE_URL,
+    "{% url 'attendance_manifest' event.attendance_token %}",
+    "{% static 'js/attendance_offline.js' %}",
+    "{% static 'css/dist/styles.css' %}",
+];
+
+self.addEventListener("install", (event) => {
+    event.waitUntil(
+        caches.open(CACHE_NAME)
+            // One missing asset must not prevent the page itself from being cached
+            .then((cache) => Promise.all(PRECACHE_URLS.map((url) => cache.add(url).catch(() => null))))
+            .then(() => self.skipWaiting())
+    );
+});
+
+self.addEventListener("activate", (event) => {
+    event.waitUntil(
+        caches.keys()
+            .then((keys) => Promise.all(
+                keys.filter((key) => key.startsWith(CACHE_PREFIX) && key !== CACHE_NAME)
+                    .map((key) => caches.delete(key))
+            ))
+            .then(() => self.clients.claim())
+    );
+});
+
+self.addEventListener("fetch", (event) => {
+    const request = event.request;
+    if (request.method !== "GET") {
+        return;
+    }
+
+    if (request.mode === "navigate") {
+        // Network first, so the page stays current while there is connectivity
+        event.respondWith(
+            fetch(request)
+                .then((response) => {
+                    if (response.ok && new URL(request.url).pathname === OFFLINE_URL) {
+                        const copy = response.clone();
+                        caches.open(CACHE_NAME).then((cache) => cache.put(OFFLINE_URL, copy));
+                    }
+                    return response;
+                })
+                .catch(() => caches.match(OFFLINE_URL))
+        );
+        return;
+    }
+
+    event.respondWith(
+        caches.match(request).then((cached) => cached || fetch(request).then((response) => {
+            if (response.ok || response.type === "opaque") {
+                const copy = response.clone();
+                caches.open(CACHE_NAME).then((cache) => cache.put(request, copy));
+            }
+            return response;
+        }))
+    );
+});
+{% endautoescape %}
@@ -11,6 +11,10 @@ urlpatterns = [
     path('events/<int:pk>/edit/', views.edit_event, name='edit_event'),
     path('events/<int:pk>/delete/', views.delete_event, name='delete_event'),
     path('events/<uuid:attendance_token>/attendance/', views.register_attendance, name='register_attendance'),
+    path('events/<uuid:attendance_token>/attendance/offline/', views.offline_attendance, name='offline_attendance'),
+    path('events/<uuid:attendance_token>/attendance/sync/', views.sync_attendance, name='sync_attendance'),
+    path('events/<uuid:attendance_token>/attendance/sw.js', views.attendance_service_worker, name='attendance_service_worker'),
+    path('events/<uuid:attendance_token>/attendance/manifest.webmanifest', views.attendance_manifest, name='attendance_manifest'),
     #Projects CRUD
     path('projects/', views.project_list, name='project_list'),
     path('projects/create/', views.project_create, name='project_create'),
@@ -27,9 +31,27 @@ urlpatterns = [
 
     # Reports
     path('reportes/', views.report_list, name='report_list'),
+    path('reportes/tendencias/', views.activity_trends, name='activity_trends'),
+    path('reportes/encuestas/', views.survey_analytics, name='survey_analytics'),
+    path('reportes/encuestas/textos/', views.download_survey_texts, name='download_survey_texts'),
+    path('events/<int:pk>/encuesta/', views.event_survey_analytics, name='event_survey_analytics'),
+    path('projects/<int:pk>/encuesta/', views.project_survey_analytics, name='project_survey_analytics'),
+    path(
+        'download/portfolio/',
+        views.download_report,
+        {'report_type': 'portfolio', 'instance_id': None},
+        name='download_portfolio_report'
+    ),
     path(
         'download/<str:report_type>/<int:instance_id>/',
         views.download_report,
         name='download_report'
     ),
+    path(
+        'reportes/trabajos/<str:report_type>/<int:instance_id>/',
+        views.enqueue_report,
+        name='enqueue_report'
+    ),
+    path('reportes/trabajos/<int:pk>/', views.report_job_status, name='report_job_status'),
+    path('reportes/trabajos/<int:pk>/descargar/', views.download_report_job, name='download_report_job'),
 ]
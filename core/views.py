@@ -5,12 +5,16 @@ Handles the calendar view, event list, and CRUD operations for events.
 Supports both full-page and HTMX partial responses.
 """
 import json
+import uuid
 from django.shortcuts import render, get_object_or_404, redirect
-from django.http import HttpResponse, Http404
+from django.http import (
+    HttpResponse, Http404, FileResponse, HttpResponseNotModified, JsonResponse, StreamingHttpResponse,
+)
 from django.db.models import Q
 from datetime import datetime, timedelta
 from calendar import monthrange
 from django.contrib import messages
+from django.core import signing
 from django.contrib.auth import login
 from .forms import (
     EventForm,
@@ -21,12 +25,24 @@ from .forms import (
     ActivityForm,
 )
 from django.urls import reverse
+from django.conf import settings
 from .services import OutreachMetricsService
-from .models import Event, Project, Activity, Attendance
+from .models import Event, Project, Activity, Attendance, ReportJob
+from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.core.exceptions import ObjectDoesNotExist
 
 from .reports_generator.factory import ReportGeneratorFactory
+from .reports_generator.tabular import FILE_FORMATS as REPORT_FILE_FORMATS
+from .report_jobs import enqueue_report_job, ReportJobLimitExceeded
+from . import report_cache
+from .attendance_bulk import MAX_SYNC_BATCH, bulk_insert_attendances, ingest_offline_submissions
+from .attendance_spool import spool_attendance
+from .cache import count_hit
+from .event_lookup import get_attendance_event_or_404
+from .rollups import PERIODS as TREND_PERIODS, get_metric_trends
+from .survey_analytics import get_survey_analytics
+from .survey_terms import get_top_terms, iter_free_text_csv
 from .decorators import (
     require_create_permission,
     require_edit_permission,
@@ -192,10 +208,10 @@ def calendar_view(request):
     first_day = datetime(year, month, 1)
     last_day = datetime(year, month, monthrange(year, month)[1])
 
+    # Events overlapping the month, as plain ranges so the dates index applies
     events = Event.objects.select_related('proyecto').filter(
-        Q(start_date__year=year, start_date__month=month) |
-        Q(end_date__year=year, end_date__month=month) |
-        Q(start_date__lt=first_day, end_date__gt=last_day)
+        start_date__lte=last_day.date(),
+        end_date__gte=first_day.date(),
     )
 
     prev_month = month - 1 if month > 1 else 12
@@ -399,6 +415,12 @@ ATTENDANCE_WIZARD_STEP_TITLES = (
 )
 
 
+# Hidden field with the signed wizard answers (ATTENDANCE_WIZARD_STATE = 'signed')
+ATTENDANCE_WIZARD_STATE_FIELD = "wizard_state"
+# Wizard state entry with the submission's idempotency key, so a resent final step is ignored
+ATTENDANCE_WIZARD_SUBMISSION_KEY = "submission_key"
+
+
 def _attendance_wizard_session_key(attendance_token):
     return f"attendance_wizard_{attendance_token}"
 
@@ -439,11 +461,94 @@ def _first_incomplete_wizard_step(data):
     return None
 
 
+def _attendance_wizard_state_salt(attendance_token):
+    return f"attendance_wizard_{attendance_token}"
+
+
+def _attendance_wizard_done_salt(attendance_token):
+    return f"attendance_wizard_completed_{attendance_token}"
+
+
+def _load_signed_wizard_state(request, attendance_token):
+    """
+    Return the wizard data carried in the signed hidden field: {} when the
+    field is missing, None when it was tampered with or has expired.
+    """
+    value = request.POST.get(ATTENDANCE_WIZARD_STATE_FIELD)
+    if not value:
+        return {}
+    try:
+        return signing.loads(
+            value,
+            salt=_attendance_wizard_state_salt(attendance_token),
+            max_age=settings.ATTENDANCE_WIZARD_STATE_MAX_AGE,
+        )
+    except signing.BadSignature:
+        return None
+
+
+def _dump_signed_wizard_state(data, attendance_token):
+    return signing.dumps(data, salt=_attendance_wizard_state_salt(attendance_token), compress=True)
+
+
+def _render_attendance_wizard_step(request, event, form, step, data, wizard_state=None, final_errors=False):
+    return render(
+        request,
+        "attendance/attendance_wizard.html",
+        {
+            "event": event,
+            "form": form,
+            "step": step,
+            "total_steps": ATTENDANCE_WIZARD_STEP_COUNT,
+            "prev_step": step - 1 if step > 1 else None,
+            "section_title": ATTENDANCE_WIZARD_SECTION_TITLES[step - 1],
+            "step_titles": ATTENDANCE_WIZARD_STEP_TITLES,
+            "session_data": data,
+            "wizard_state": wizard_state,
+            "show_final_validation_errors": final_errors,
+        },
+    )
+
+
+def _store_attendance(event, form, submission_key):
+    """
+    Save a validated registration: insert it now, or spool it for the
+    ingestion worker when ATTENDANCE_INGESTION is 'spool'.
+
+    Returns:
+        bool: False when the insert was skipped because the event already has
+        this submission or this participant (spooled ones are checked later)
+    """
+    if settings.ATTENDANCE_INGESTION == "spool":
+        spool_attendance(event, form.cleaned_data, submission_key)
+        return True
+    attendance = form.save(commit=False)
+    attendance.event = event
+    attendance.submission_key = uuid.UUID(submission_key)
+    return bool(bulk_insert_attendances([attendance], {event.pk: event.proyecto_id}))
+
+
+def _attendance_stored_message(request, stored):
+    if stored:
+        messages.success(
+            request,
+            "¡Gracias por registrar tu asistencia y completar la encuesta!",
+        )
+    else:
+        messages.info(request, "Tu asistencia a este evento ya estaba registrada.")
+
+
 def register_attendance(request, attendance_token):
     """
-    Multi-step attendance registration (session-backed wizard), then thank-you page.
+    Multi-step attendance registration wizard, then thank-you page.
+
+    The answers of the finished steps are kept in a signed hidden field by
+    default, or in the session when ATTENDANCE_WIZARD_STATE is 'session'.
     """
-    event = get_object_or_404(Event, attendance_token=attendance_token)
+    event = get_attendance_event_or_404(attendance_token)
+    if settings.ATTENDANCE_WIZARD_STATE == "signed":
+        return _register_attendance_signed(request, event)
+
     session_key = _attendance_wizard_session_key(attendance_token)
     completed_key = _attendance_wizard_completed_key(attendance_token)
     wizard_url = reverse("register_attendance", kwargs={"attendance_token": attendance_token})
@@ -476,6 +581,7 @@ def register_attendance(request, attendance_token):
         form = form_cls(request.POST)
         if form.is_valid():
             merged = {**session_data, **form.cleaned_data}
+            merged.setdefault(ATTENDANCE_WIZARD_SUBMISSION_KEY, uuid.uuid4().hex)
             request.session[session_key] = merged
             request.session.modified = True
 
@@ -485,54 +591,21 @@ def register_attendance(request, attendance_token):
 
             final_form = AttendanceForm(data=merged)
             if final_form.is_valid():
-                attendance = final_form.save(commit=False)
-                attendance.event = event
-                attendance.save()
+                stored = _store_attendance(event, final_form, merged[ATTENDANCE_WIZARD_SUBMISSION_KEY])
                 request.session.pop(session_key, None)
                 request.session[completed_key] = True
-                messages.success(
-                    request,
-                    "¡Gracias por registrar tu asistencia y completar la encuesta!",
-                )
+                _attendance_stored_message(request, stored)
                 return redirect(f"{wizard_url}?completado=1")
 
             messages.error(
                 request,
                 "No se pudo guardar el registro. Revise los datos e intente de nuevo.",
             )
-            return render(
-                request,
-                "attendance/attendance_wizard.html",
-                {
-                    "event": event,
-                    "form": final_form,
-                    "step": ATTENDANCE_WIZARD_STEP_COUNT,
-                    "total_steps": ATTENDANCE_WIZARD_STEP_COUNT,
-                    "prev_step": ATTENDANCE_WIZARD_STEP_COUNT - 1,
-                    "section_title": ATTENDANCE_WIZARD_SECTION_TITLES[
-                        ATTENDANCE_WIZARD_STEP_COUNT - 1
-                    ],
-                    "step_titles": ATTENDANCE_WIZARD_STEP_TITLES,
-                    "session_data": merged,
-                    "show_final_validation_errors": True,
-                },
+            return _render_attendance_wizard_step(
+                request, event, final_form, ATTENDANCE_WIZARD_STEP_COUNT, merged, final_errors=True,
             )
 
-        return render(
-            request,
-            "attendance/attendance_wizard.html",
-            {
-                "event": event,
-                "form": form,
-                "step": posted_step,
-                "total_steps": ATTENDANCE_WIZARD_STEP_COUNT,
-                "prev_step": posted_step - 1 if posted_step > 1 else None,
-                "section_title": ATTENDANCE_WIZARD_SECTION_TITLES[posted_step - 1],
-                "step_titles": ATTENDANCE_WIZARD_STEP_TITLES,
-                "session_data": session_data,
-                "show_final_validation_errors": False,
-            },
-        )
+        return _render_attendance_wizard_step(request, event, form, posted_step, session_data)
 
     try:
         step = int(request.GET.get("step", "1"))
@@ -546,24 +619,185 @@ def register_attendance(request, attendance_token):
 
     form_cls = ATTENDANCE_WIZARD_STEP_FORMS[step - 1]
     form = form_cls(initial=session_data)
+    return _render_attendance_wizard_step(request, event, form, step, session_data)
 
+
+def _register_attendance_signed(request, event):
+    """
+    Attendance wizard that keeps the finished steps in a signed, compressed
+    hidden field instead of the session.
+
+    Every step is a POST that carries the state back to the server, which
+    validates it and renders the next step directly, so the database is only
+    written by the final step's INSERT. The thank-you redirect carries a signed
+    marker instead of a session flag.
+    """
+    attendance_token = event.attendance_token
+    wizard_url = reverse("register_attendance", kwargs={"attendance_token": attendance_token})
+
+    if request.GET.get("completado"):
+        try:
+            signing.loads(
+                request.GET["completado"],
+                salt=_attendance_wizard_done_salt(attendance_token),
+                max_age=settings.ATTENDANCE_WIZARD_STATE_MAX_AGE,
+            )
+        except signing.BadSignature:
+            return redirect(wizard_url)
+        return render(request, "attendance/attendance_thanks.html", {"event": event})
+
+    if request.GET.get("reiniciar") == "1":
+        messages.info(request, "Se reinició el formulario.")
+        return redirect(wizard_url)
+
+    if request.method != "POST":
+        return _render_attendance_wizard_step(
+            request, event, ATTENDANCE_WIZARD_STEP_FORMS[0](), 1, {},
+            wizard_state=_dump_signed_wizard_state({}, attendance_token),
+        )
+
+    data = _load_signed_wizard_state(request, attendance_token)
+    if data is None:
+        messages.error(request, "El formulario expiró. Por favor, empieza de nuevo.")
+        return redirect(wizard_url)
+
+    try:
+        posted_step = int(request.POST.get("wizard_step", "1"))
+    except (TypeError, ValueError):
+        posted_step = 1
+    posted_step = max(1, min(posted_step, ATTENDANCE_WIZARD_STEP_COUNT))
+
+    if request.POST.get("wizard_nav") == "prev" and posted_step > 1:
+        # Going back discards the current step's unsaved answers, like the session wizard
+        step = posted_step - 1
+        return _render_attendance_wizard_step(
+            request, event, ATTENDANCE_WIZARD_STEP_FORMS[step - 1](initial=data), step, data,
+            wizard_state=_dump_signed_wizard_state(data, attendance_token),
+        )
+
+    form = ATTENDANCE_WIZARD_STEP_FORMS[posted_step - 1](request.POST)
+    if not form.is_valid():
+        return _render_attendance_wizard_step(
+            request, event, form, posted_step, data,
+            wizard_state=_dump_signed_wizard_state(data, attendance_token),
+        )
+
+    merged = {**data, **form.cleaned_data}
+    merged.setdefault(ATTENDANCE_WIZARD_SUBMISSION_KEY, uuid.uuid4().hex)
+    if posted_step < ATTENDANCE_WIZARD_STEP_COUNT:
+        step = posted_step + 1
+        return _render_attendance_wizard_step(
+            request, event, ATTENDANCE_WIZARD_STEP_FORMS[step - 1](initial=merged), step, merged,
+            wizard_state=_dump_signed_wizard_state(merged, attendance_token),
+        )
+
+    final_form = AttendanceForm(data=merged)
+    if final_form.is_valid():
+        submission_key = merged[ATTENDANCE_WIZARD_SUBMISSION_KEY]
+        _attendance_stored_message(request, _store_attendance(event, final_form, submission_key))
+        done = signing.dumps(submission_key, salt=_attendance_wizard_done_salt(attendance_token))
+        return redirect(f"{wizard_url}?completado={done}")
+
+    messages.error(
+        request,
+        "No se pudo guardar el registro. Revise los datos e intente de nuevo.",
+    )
+    return _render_attendance_wizard_step(
+        request, event, final_form, ATTENDANCE_WIZARD_STEP_COUNT, merged,
+        wizard_state=_dump_signed_wizard_state(merged, attendance_token),
+        final_errors=True,
+    )
+
+
+def offline_attendance(request, attendance_token):
+    """
+    Single-page attendance form that works offline (PWA).
+
+    The service worker caches this page and its assets; submissions are kept
+    in the browser with an idempotency key and sent to ``sync_attendance``
+    whenever there is connectivity.
+    """
+    event = get_attendance_event_or_404(attendance_token)
     return render(
         request,
-        "attendance/attendance_wizard.html",
+        "attendance/offline_form.html",
         {
             "event": event,
-            "form": form,
-            "step": step,
-            "total_steps": ATTENDANCE_WIZARD_STEP_COUNT,
-            "prev_step": step - 1 if step > 1 else None,
-            "section_title": ATTENDANCE_WIZARD_SECTION_TITLES[step - 1],
-            "step_titles": ATTENDANCE_WIZARD_STEP_TITLES,
-            "session_data": session_data,
-            "show_final_validation_errors": False,
+            "form": AttendanceForm(),
+            "max_batch": MAX_SYNC_BATCH,
         },
     )
 
 
+# Queued submissions may be sent hours after the page (and its CSRF token) was
+# cached; like the wizard, the endpoint is public and scoped by the event token.
+@csrf_exempt
+@require_http_methods(["POST"])
+def sync_attendance(request, attendance_token):
+    """
+    Bulk endpoint for the offline form: validates every submission with
+    AttendanceForm and inserts the new ones with one bulk_create.
+    Expects ``{"submissions": [{"key": "<uuid>", "data": {...}}, ...]}``.
+
+    Each event and client address gets ATTENDANCE_SYNC_RATE_LIMIT requests per
+    minute (429 beyond that) and bodies of up to ATTENDANCE_SYNC_MAX_BYTES (413).
+    """
+    event = get_attendance_event_or_404(attendance_token)
+    client = request.META.get("REMOTE_ADDR", "")
+    if count_hit(f"attendance-sync:{attendance_token}:{client}", 60) > settings.ATTENDANCE_SYNC_RATE_LIMIT:
+        response = JsonResponse({"error": "Demasiadas solicitudes. Intenta de nuevo en un minuto."}, status=429)
+        response["Retry-After"] = "60"
+        return response
+    try:
+        content_length = int(request.META.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        content_length = 0
+    if max(content_length, len(request.body)) > settings.ATTENDANCE_SYNC_MAX_BYTES:
+        return JsonResponse({"error": "La solicitud es demasiado grande."}, status=413)
+    try:
+        submissions = json.loads(request.body)["submissions"]
+    except (ValueError, KeyError, TypeError):
+        return JsonResponse({"error": "Solicitud inválida."}, status=400)
+    if not isinstance(submissions, list) or len(submissions) > MAX_SYNC_BATCH:
+        return JsonResponse(
+            {"error": f"Se esperaba una lista de hasta {MAX_SYNC_BATCH} registros."}, status=400
+        )
+    return JsonResponse(ingest_offline_submissions(event, submissions))
+
+
+def attendance_service_worker(request, attendance_token):
+    """
+    Service worker of the offline form, served under the event's attendance
+    path so its scope covers only that event.
+    """
+    event = get_attendance_event_or_404(attendance_token)
+    response = render(
+        request,
+        "attendance/service_worker.js",
+        {"event": event},
+        content_type="application/javascript",
+    )
+    response["Cache-Control"] = "no-cache"
+    return response
+
+
+def attendance_manifest(request, attendance_token):
+    """Web app manifest so the offline form can be installed on a phone."""
+    event = get_attendance_event_or_404(attendance_token)
+    offline_url = reverse("offline_attendance", kwargs={"attendance_token": attendance_token})
+    manifest = {
+        "name": f"Asistencia: {event.name}",
+        "short_name": "Asistencia",
+        "start_url": offline_url,
+        "scope": reverse("register_attendance", kwargs={"attendance_token": attendance_token}),
+        "display": "standalone",
+        "background_color": "#F6F5F0",
+        "theme_color": "#3366CC",
+        "lang": "es",
+    }
+    return JsonResponse(manifest, content_type="application/manifest+json", json_dumps_params={"ensure_ascii": False})
+
+
 # -------------------------
 # PROJECT VIEWS (CRUD)
 # -------------------------
@@ -759,23 +993,175 @@ def report_list(request):
         return render(request, 'reports/partials/report_list.html', context)
     return render(request, 'reports/report_list.html', context)
 
+
+@require_authenticated
+@require_http_methods(["GET"])
+def activity_trends(request):
+    """
+    Activity metric totals per month, quarter or year.
+    Reads the monthly rollup table, so it never scans the activities.
+    Supports filtering by project, area and year.
+    Returns partial template for HTMX requests, full page otherwise.
+    """
+    period = request.GET.get('periodo', 'quarter')
+    if period not in TREND_PERIODS:
+        period = 'quarter'
+    project_filter = request.GET.get('proyecto', '')
+    area_filter = request.GET.get('area', '')
+    year = request.GET.get('anio', '')
+
+    start = end = None
+    if year.isdigit():
+        start = datetime(int(year), 1, 1).date()
+        end = datetime(int(year), 12, 31).date()
+
+    rows = get_metric_trends(
+        period=period,
+        project=int(project_filter) if project_filter.isdigit() else None,
+        area=area_filter or None,
+        start=start,
+        end=end,
+    )
+    for row in rows:
+        if period == 'month':
+            row['label'] = row['period'].strftime('%Y-%m')
+        elif period == 'quarter':
+            row['label'] = f"{row['period'].year}-T{(row['period'].month - 1) // 3 + 1}"
+        else:
+            row['label'] = str(row['period'].year)
+        row['values'] = [row[field] for field in Activity.METRIC_FIELDS]
+
+    context = {
+        'rows': rows,
+        'metric_labels': [
+            Activity._meta.get_field(field).verbose_name for field in Activity.METRIC_FIELDS
+        ],
+        'period': period,
+        'project_filter': project_filter,
+        'area_filter': area_filter,
+        'year': year,
+    }
+
+    if request.htmx:
+        return render(request, 'reports/partials/activity_trends.html', context)
+
+    context.update({
+        'projects': Project.objects.order_by('name'),
+        'areas': Activity.PROGRAM_CHOICES,
+    })
+    return render(request, 'reports/activity_trends.html', context)
+
+@require_authenticated
+def survey_analytics(request):
+    """
+    Attendance survey results across every event.
+    """
+    return _render_survey_analytics(
+        request,
+        get_survey_analytics('global'),
+        get_top_terms(),
+        'Todas las encuestas',
+        reverse('download_survey_texts'),
+    )
+
+
+@require_authenticated
+def project_survey_analytics(request, pk):
+    """
+    Attendance survey results of the events of a project.
+    """
+    project = get_object_or_404(Project, pk=pk)
+    return _render_survey_analytics(
+        request,
+        get_survey_analytics('project', project.pk),
+        get_top_terms(project=project.pk),
+        f'Proyecto: {project.name}',
+        f"{reverse('download_survey_texts')}?proyecto={project.pk}",
+    )
+
+
+@require_authenticated
+def event_survey_analytics(request, pk):
+    """
+    Attendance survey results of a single event.
+    """
+    event = get_object_or_404(Event, pk=pk)
+    return _render_survey_analytics(
+        request,
+        get_survey_analytics('event', event.pk),
+        get_top_terms(event=event.pk),
+        f'Evento: {event.name}',
+        f"{reverse('download_survey_texts')}?evento={event.pk}",
+    )
+
+
+def _render_survey_analytics(request, analytics, top_terms, scope_label, texts_url):
+    """Render the analytics page (or its partial for HTMX requests)."""
+    context = {
+        'analytics': analytics,
+        'top_terms': top_terms,
+        'scope_label': scope_label,
+        'texts_url': texts_url,
+        'item_labels': [item['label'] for item in analytics['items']],
+    }
+    if request.htmx:
+        return render(request, 'reports/partials/survey_analytics.html', context)
+    return render(request, 'reports/survey_analytics.html', context)
+
+
+@require_authenticated
+@require_http_methods(["GET"])
+def download_survey_texts(request):
+    """
+    Stream the free-text survey answers as CSV, optionally for one event
+    (?evento=) or project (?proyecto=). Rows are written as they are read,
+    so the export never builds a workbook or holds every response in memory.
+    """
+    attendances = Attendance.objects.all()
+    event_id = request.GET.get('evento', '')
+    project_id = request.GET.get('proyecto', '')
+    if event_id.isdigit():
+        attendances = attendances.filter(event_id=int(event_id))
+    elif project_id.isdigit():
+        attendances = attendances.filter(event__proyecto_id=int(project_id))
+
+    response = StreamingHttpResponse(
+        iter_free_text_csv(attendances), content_type='text/csv; charset=utf-8'
+    )
+    filename = f"Respuestas_Abiertas_{datetime.now():%Y-%m-%d}.csv"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
 @require_authenticated
 @require_http_methods(["GET"])
 def download_report(request, report_type, instance_id):
     """
-    Unified view to download Excel report for any model type.
+    Unified view to download a report for any model type.
     
     Args:
         request: HttpRequest object
-        report_type: Type of report ('activity', 'event', 'project')
-        instance_id: ID of the instance to generate report for
+        report_type: Type of report ('activity', 'event', 'project', 'portfolio')
+        instance_id: ID of the instance to generate report for (None for 'portfolio')
+    
+    Query parameters:
+        format: 'xlsx' (default), 'csv' or 'json'
+        sheet: For CSV/JSON, export only this sheet (CSV defaults to 'Datos')
         
+    Generated files are served from the content-addressed report cache when
+    the underlying data has not changed; the cache key doubles as the ETag.
+    
     Returns:
-        HttpResponse with Excel file
+        FileResponse with the report file (304 if the client copy is current)
         
     Raises:
-        Http404: If instance doesn't exist or report type is invalid
+        Http404: If instance doesn't exist or report type or format is invalid
     """
+    file_format = request.GET.get('format', 'xlsx')
+    if file_format not in REPORT_FILE_FORMATS:
+        raise Http404(f"Formato de reporte inválido: {file_format}")
+    sheet = request.GET.get('sheet') or None
+    
     try:
         # Create the appropriate generator using the factory
         generator = ReportGeneratorFactory.create(report_type, instance_id)
@@ -789,16 +1175,43 @@ def download_report(request, report_type, instance_id):
         if not is_valid:
             raise Http404(f"Error al generar reporte: {error_msg}")
         
-        # Generate the Excel file
-        excel_file = generator.generate_excel()
-        filename = generator.get_filename()
+        cache_key = report_cache.get_cache_key(report_type, generator, file_format, sheet)
+        etag = f'"{cache_key}"'
+        if etag in request.headers.get('If-None-Match', ''):
+            response = HttpResponseNotModified()
+            response['ETag'] = etag
+            return response
+        
+        # Generate the file only on a cache miss
+        report_file = None
+        cached_path = report_cache.get(cache_key)
+        if cached_path is None:
+            report_file = generator.generate(file_format, sheet=sheet)
+            cached_path = report_cache.put(cache_key, report_file)
+        try:
+            content = open(cached_path, 'rb')
+        except FileNotFoundError:
+            # Evicted by another process in the meantime: serve the bytes directly
+            if report_file is None:
+                report_file = generator.generate(file_format, sheet=sheet)
+            report_file.seek(0)
+            content = report_file
+        filename = generator.get_filename(file_format)
         
         # Create HTTP response
-        response = HttpResponse(
-            excel_file.read(),
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        response = FileResponse(
+            content,
+            as_attachment=True,
+            filename=filename,
+            content_type=REPORT_FILE_FORMATS[file_format]
         )
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        if settings.REPORTS_SERVER_TIMING:
+            if generator.profile.spans:
+                response['Server-Timing'] = generator.profile.server_timing()
+            else:
+                response['Server-Timing'] = 'cache;desc="hit"'
         
         return response
         
@@ -817,6 +1230,63 @@ def download_report(request, report_type, instance_id):
 
 
 
+def _get_user_report_job(request, pk):
+    """Return a report job owned by the current user (superusers can see all)."""
+    jobs = ReportJob.objects.all()
+    if not request.user.is_superuser:
+        jobs = jobs.filter(requested_by=request.user)
+    return get_object_or_404(jobs, pk=pk)
+
+
+@require_authenticated
+@require_http_methods(["POST"])
+def enqueue_report(request, report_type, instance_id):
+    """
+    Queue a report for background generation and return the status fragment.
+    The fragment polls report_job_status until the file is ready.
+    """
+    try:
+        job = enqueue_report_job(report_type, instance_id, user=request.user)
+    except ValueError as e:
+        raise Http404(f"Tipo de reporte inválido: {str(e)}")
+    except ReportJobLimitExceeded as e:
+        return render(request, 'reports/partials/report_job_status.html', {
+            'job': None,
+            'error': str(e),
+        })
+
+    return render(request, 'reports/partials/report_job_status.html', {'job': job})
+
+
+@require_authenticated
+@require_http_methods(["GET"])
+def report_job_status(request, pk):
+    """Status fragment for a queued report (HTMX polling target)."""
+    job = _get_user_report_job(request, pk)
+    return render(request, 'reports/partials/report_job_status.html', {'job': job})
+
+
+@require_authenticated
+@require_http_methods(["GET"])
+def download_report_job(request, pk):
+    """Serve the file produced by a finished background report job."""
+    job = _get_user_report_job(request, pk)
+    if job.status != ReportJob.StatusChoices.DONE or not job.file_path:
+        raise Http404("El reporte todavía no está disponible")
+
+    try:
+        report_file = open(job.file_path, 'rb')
+    except FileNotFoundError:
+        raise Http404("El archivo del reporte ya no está disponible")
+
+    return FileResponse(
+        report_file,
+        as_attachment=True,
+        filename=job.filename,
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    )
+
+
 
 @require_delete_permission
 def export_report_stub(request, object_type, pk):
@@ -0,0 +1,136 @@
+/**
+ * Offline Attendance Form
+ *
+ * Keeps each submission in localStorage with a client-generated idempotency
+ * key and sends the queue to the bulk sync endpoint whenever the browser is
+ * online. The server ignores keys it already stored, so resending a batch
+ * whose response was lost is always safe.
+ */
+(function () {
+    const form = document.getElementById('offline-attendance-form');
+    if (!form) {
+        return;
+    }
+
+    const syncUrl = form.dataset.syncUrl;
+    const queueKey = form.dataset.queueKey;
+    const maxBatch = parseInt(form.dataset.maxBatch, 10) || 50;
+    const statusEl = document.getElementById('offline-status');
+    const SYNC_INTERVAL = 30000;
+
+    let syncing = false;
+    // Halved when the server finds a batch too large (413)
+    let batchSize = maxBatch;
+    let rejectedCount = 0;
+
+    function loadQueue() {
+        try {
+            return JSON.parse(localStorage.getItem(queueKey)) || [];
+        } catch (error) {
+            return [];
+        }
+    }
+
+    function saveQueue(queue) {
+        localStorage.setItem(queueKey, JSON.stringify(queue));
+    }
+
+    function newKey() {
+        if (window.crypto && crypto.randomUUID) {
+            return crypto.randomUUID();
+        }
+        // RFC 4122 version 4 UUID for browsers without randomUUID()
+        const bytes = crypto.getRandomValues(new Uint8Array(16));
+        bytes[6] = (bytes[6] & 0x0f) | 0x40;
+        bytes[8] = (bytes[8] & 0x3f) | 0x80;
+        const hex = Array.from(bytes, (b) => b.toString(16).padStart(2, '0')).join('');
+        return [hex.slice(0, 8), hex.slice(8, 12), hex.slice(12, 16), hex.slice(16, 20), hex.slice(20)].join('-');
+    }
+
+    function showStatus(message) {
+        const pending = loadQueue().length;
+        const lines = [];
+        if (message) {
+            lines.push(message);
+        }
+        if (pending) {
+            lines.push(pending + ' registro(s) pendiente(s) de envío' + (navigator.onLine ? '.' : ' (sin conexión).'));
+        } else {
+            lines.push('Todos los registros de este dispositivo fueron enviados.');
+        }
+        if (rejectedCount) {
+            lines.push(rejectedCount + ' registro(s) no se pudieron guardar porque tenían datos incompletos.');
+        }
+        statusEl.textContent = lines.join(' ');
+        statusEl.classList.toggle('alert-warning', pending > 0 || rejectedCount > 0);
+        statusEl.classList.toggle('alert-success', pending === 0 && rejectedCount === 0);
+    }
+
+    function collectData() {
+        const data = {};
+        new FormData(form).forEach(function (value, name) {
+            if (name !== 'csrfmiddlewaretoken') {
+                data[name] = value;
+            }
+        });
+        return data;
+    }
+
+    async function sync() {
+        const queue = loadQueue();
+        if (syncing || !queue.length || !navigator.onLine) {
+            showStatus();
+            return;
+        }
+
+        syncing = true;
+        let sent = false;
+        try {
+            const response = await fetch(syncUrl, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ submissions: queue.slice(0, batchSize) }),
+            });
+            if (response.status === 413 && batchSize > 1) {
+                batchSize = Math.max(1, Math.floor(batchSize / 2));
+                sent = true;
+            } else if (response.ok) {
+                const result = await response.json();
+                const rejected = Object.keys(result.rejected);
+                const done = new Set(result.accepted.concat(result.duplicates, rejected));
+                rejectedCount += rejected.length;
+                saveQueue(loadQueue().filter((item) => !done.has(item.key)));
+                sent = done.size > 0;
+            }
+        } catch (error) {
+            // Still offline: the queue is kept and retried later
+        } finally {
+            syncing = false;
+        }
+
+        showStatus();
+        if (sent && loadQueue().length) {
+            sync();
+        }
+    }
+
+    form.addEventListener('submit', function (event) {
+        event.preventDefault();
+        const queue = loadQueue();
+        queue.push({ key: newKey(), data: collectData(), saved_at: new Date().toISOString() });
+        saveQueue(queue);
+        form.reset();
+        window.scrollTo(0, 0);
+        showStatus('¡Gracias! El registro quedó guardado en este dispositivo.');
+        sync();
+    });
+
+    window.addEventListener('online', sync);
+    setInterval(sync, SYNC_INTERVAL);
+
+    if ('serviceWorker' in navigator) {
+        navigator.serviceWorker.register(form.dataset.serviceWorkerUrl, { scope: form.dataset.scope });
+    }
+
+    sync();
+})();
@@ -8,5 +8,7 @@ urlpatterns = [
     path('', include('core.urls')),
     path('users/', include('users.urls', namespace='users')),
     path('oauth/', include('social_django.urls', namespace='social')),
-    path("__reload__/", include("django_browser_reload.urls")),
-]
\ No newline at end of file
+]
+
+if 'django_browser_reload' in settings.INSTALLED_APPS:
+    urlpatterns.append(path("__reload__/", include("django_browser_reload.urls")))